@@ -1,11 +1,54 @@
 
 import json
+import array
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+import http.client
+import urllib.error
+import urllib.parse
 import urllib.request
 import math
+import bisect
+import functools
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 import flet as ft
 
 PRODUCTS_JSON_URL = "https://raw.githubusercontent.com/MDAnwarHossen/ema-john/refs/heads/main/products.json"
 COLORS = getattr(ft, "colors", getattr(ft, "Colors", None))
+# Supplier feeds merged into one catalog; see merge_feeds for precedence
+PRODUCT_FEEDS = [PRODUCTS_JSON_URL]
+# Rule picking one product when several feeds carry the same id:
+# a FEED_PRECEDENCE name or a callable(kept, candidate)
+FEED_MERGE_RULE = "first"
+# Maximum number of feeds downloaded at the same time
+FEED_WORKERS = 4
+# Seconds between background catalog refreshes (0 disables the sync thread)
+CATALOG_SYNC_INTERVAL = 300
+# Binary catalog snapshot read at startup instead of downloading and parsing the feeds (None disables)
+CATALOG_SNAPSHOT_PATH = "catalog.snap"
+# Search results kept per catalog for repeated and incrementally typed queries
+QUERY_CACHE_SIZE = 128
+# Paged catalog API used instead of the feeds when set (see PagedCatalog)
+CATALOG_PAGES_URL = None
+# Server-side search endpoint of the paged API (None searches page by page)
+CATALOG_SEARCH_URL = None
+# Products per API page, and API pages kept in memory per session
+CATALOG_PAGE_SIZE = 100
+CATALOG_PAGE_CACHE = 64
+# Product cards added to the grid per "Show more" step
+GRID_PAGE_SIZE = 48
+# Grid tiles kept for reuse before the ones not on screen are dropped
+GRID_CARD_CACHE = 1000
 
 # ImageFit compatibility
 try:
@@ -18,50 +61,191 @@ except Exception:
     except Exception:
         FIT_CONTAIN = "contain"
 
-# --- GLOBAL STATE (Used by nested handler functions) ---
-is_logged_in = False
-# Tracks where the user should go after a successful login: "home" or "checkout"
-login_redirect_target = "home"
-# -------------------------------------------------------
+def clean_product(p, i):
+    """Normalizes one raw feed record into the product dict used by the UI."""
+    return {
+        "id": str(p.get("id", i)),
+        "name": p.get("name", "Unnamed product"),
+        "price": float(p.get("price", 0)),
+        "img": p.get("img", "") or p.get("image", ""),
+        "category": p.get("category", ""),
+        "seller": p.get("seller", ""),
+        "stock": int(p.get("stock", p.get("quantity", 10) or 0)),
+        "ratings": float(p.get("ratings", p.get("rating", 0)) or 0),
+        "ratingsCount": int(p.get("ratingsCount", p.get("ratingCount", 0) or 0)),
+        "shipping": float(p.get("shipping", 0) or 0),
+    }
+
+
+# Idle keep-alive HTTP connections per (scheme, host), shared by all workers
+_idle_connections = {}
+_connections_lock = threading.Lock()
+_feed_executor = None
+_feed_executor_lock = threading.Lock()
+# Last successfully parsed response body per feed, used when a feed fails
+# later. Bodies rather than products, so every reuse gets fresh dicts that no
+# catalog has patched.
+_last_good_feeds = {}
+
+
+def http_get(url, timeout=8, redirects=3):
+    """GETs `url` and returns the body, reusing an idle connection to the host."""
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            return resp.read()
+
+    key = (parts.scheme, parts.netloc)
+    path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+    # A pooled connection may have been closed by the server; only then retry
+    # once on a fresh one, so a feed that hangs or refuses costs one timeout
+    with _connections_lock:
+        idle = _idle_connections.get(key)
+        conn = idle.pop() if idle else None
+    pooled = conn is not None
+    while True:
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = conn_cls(parts.netloc, timeout=timeout)
+        try:
+            conn.request("GET", path, headers={"User-Agent": "ema-john"})
+            resp = conn.getresponse()
+            body = resp.read()
+        except TimeoutError:
+            conn.close()
+            raise
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not pooled:
+                raise
+            conn, pooled = None, False
+            continue
+        if resp.will_close:
+            conn.close()
+        else:
+            with _connections_lock:
+                _idle_connections.setdefault(key, []).append(conn)
+        if resp.status in (301, 302, 303, 307, 308) and redirects > 0:
+            location = urllib.parse.urljoin(url, resp.getheader("Location", ""))
+            return http_get(location, timeout, redirects - 1)
+        if resp.status != 200:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return body
+
+
+def parse_products(body):
+    """Cleans the products of one feed response body. Raises on parse errors."""
+    data = json.loads(body.decode())
+    return [clean_product(p, i) for i, p in enumerate(data)]
+
+
+def fetch_products(url=PRODUCTS_JSON_URL, timeout=8):
+    """Downloads and cleans the product feed. Raises on network or parse errors."""
+    return parse_products(http_get(url, timeout))
+
+
+# Rules for picking one product when several feeds carry the same id.
+# Each takes (kept, candidate) and returns the product to keep.
+FEED_PRECEDENCE = {
+    "first": lambda kept, new: kept,
+    "last": lambda kept, new: new,
+    "cheapest": lambda kept, new: new if new["price"] < kept["price"] else kept,
+    "most_stock": lambda kept, new: new if new.get("stock", 0) > kept.get("stock", 0) else kept,
+}
 
 
-def safe_load_products(url=PRODUCTS_JSON_URL, timeout=8):
-    """Loads product data from a remote JSON file with basic data cleaning."""
+def merge_feeds(feeds, precedence="first"):
+    """Merges cleaned feeds into one list with a single product per `id`.
+
+    `feeds` are in priority order. `precedence` is a FEED_PRECEDENCE name or
+    a callable(kept, candidate). Products keep their first-seen position.
+    """
+    pick = FEED_PRECEDENCE[precedence] if isinstance(precedence, str) else precedence
+    merged = {}
+    for feed in feeds:
+        for p in feed:
+            kept = merged.get(p["id"])
+            merged[p["id"]] = p if kept is None else pick(kept, p)
+    return list(merged.values())
+
+
+def feed_list(sources=None):
+    """The feed URLs to load: `sources` as a list, or PRODUCT_FEEDS."""
+    sources = sources or PRODUCT_FEEDS
+    return [sources] if isinstance(sources, str) else list(sources)
+
+
+def _fetch_feed(url, timeout):
     try:
-        with urllib.request.urlopen(url, timeout=timeout) as resp:
-            data = json.loads(resp.read().decode())
-            cleaned = []
-            for i, p in enumerate(data):
-                cleaned.append({
-                    "id": str(p.get("id", i)),
-                    "name": p.get("name", "Unnamed product"),
-                    "price": float(p.get("price", 0)),
-                    "img": p.get("img", "") or p.get("image", ""),
-                    "category": p.get("category", ""),
-                    "seller": p.get("seller", ""),
-                    "stock": int(p.get("stock", p.get("quantity", 10) or 0)),
-                    "ratings": float(p.get("ratings", p.get("rating", 0)) or 0),
-                    "ratingsCount": int(p.get("ratingsCount", p.get("ratingCount", 0) or 0)),
-                    "shipping": float(p.get("shipping", 0) or 0),
-                })
-            return cleaned
+        body = http_get(url, timeout)
+        products = parse_products(body)
+    except Exception as e:
+        stale = _last_good_feeds.get(url)
+        print("Warning: failed to load product feed", url, "-", e,
+              "(using last good copy)" if stale is not None else "")
+        return parse_products(stale) if stale is not None else None
+    _last_good_feeds[url] = body
+    return products
+
+
+def load_feeds(sources=None, precedence="first", timeout=8, failed=None):
+    """Fetches all feeds concurrently and merges them.
+
+    Feeds run on a shared pool of FEED_WORKERS threads, so the wait is about
+    the slowest feed. A failing feed falls back to its last good copy or is
+    left out; left-out sources are appended to the `failed` list if given.
+    RuntimeError is raised only if no feed produced products.
+    """
+    global _feed_executor
+    sources = feed_list(sources)
+    with _feed_executor_lock:
+        if _feed_executor is None:
+            # Long-lived workers keep their keep-alive connections between syncs
+            _feed_executor = ThreadPoolExecutor(
+                max_workers=FEED_WORKERS, thread_name_prefix="feed")
+    results = list(_feed_executor.map(
+        lambda url: _fetch_feed(url, timeout), sources))
+    feeds = [r for r in results if r is not None]
+    if failed is not None:
+        failed.extend(url for url, r in zip(sources, results) if r is None)
+    if not feeds:
+        raise RuntimeError("no product feed could be loaded")
+    return merge_feeds(feeds, precedence)
+
+
+def fallback_products():
+    """Small built-in catalog used when no product feed can be loaded."""
+    return [
+        {"id": "f1", "name": "Headphones, Premium Studio Quality", "price": 199.99,
+         "img": "https://via.placeholder.com/220x160?text=Headphones", "stock": 10, "ratings": 4.8, "ratingsCount": 340, "shipping": 5.0},
+        {"id": "f2", "name": "Ceramic Coffee Mug with Ergonomic Handle", "price": 7.50,
+         "img": "https://via.placeholder.com/220x160?text=Mug", "stock": 15, "ratings": 4.6, "ratingsCount": 80, "shipping": 3.0},
+        {"id": "f3", "name": "4K Ultra HD Webcam with Auto-Focus", "price": 89.99,
+         "img": "https://via.placeholder.com/220x160?text=Webcam", "stock": 5, "ratings": 4.1, "ratingsCount": 120, "shipping": 4.5},
+        {"id": "f4", "name": "Mechanical Keyboard, RGB Backlit", "price": 120.00,
+         "img": "https://via.placeholder.com/220x160?text=Keyboard", "stock": 25, "ratings": 4.9, "ratingsCount": 550, "shipping": 6.0},
+        {"id": "f5", "name": "Wireless Charging Pad, Fast Charge", "price": 25.00,
+         "img": "https://via.placeholder.com/220x160?text=Charger", "stock": 30, "ratings": 4.3, "ratingsCount": 90, "shipping": 2.0},
+    ]
+
+
+def safe_load_products(sources=None, timeout=8, precedence="first", failed=None):
+    """Loads and merges the product feeds, with local fallback data if all fail.
+
+    Sources left out are appended to `failed` if given; when the fallback
+    data is returned, that is every source.
+    """
+    try:
+        return load_feeds(sources, precedence, timeout, failed)
     except Exception as e:
         print("Warning: failed to load remote products:", e)
-        # Fallback data
-        return [
-            {"id": "f1", "name": "Headphones, Premium Studio Quality", "price": 199.99,
-             "img": "https://via.placeholder.com/220x160?text=Headphones", "stock": 10, "ratings": 4.8, "ratingsCount": 340, "shipping": 5.0},
-            {"id": "f2", "name": "Ceramic Coffee Mug with Ergonomic Handle", "price": 7.50,
-             "img": "https://via.placeholder.com/220x160?text=Mug", "stock": 15, "ratings": 4.6, "ratingsCount": 80, "shipping": 3.0},
-            {"id": "f3", "name": "4K Ultra HD Webcam with Auto-Focus", "price": 89.99,
-             "img": "https://via.placeholder.com/220x160?text=Webcam", "stock": 5, "ratings": 4.1, "ratingsCount": 120, "shipping": 4.5},
-            {"id": "f4", "name": "Mechanical Keyboard, RGB Backlit", "price": 120.00,
-             "img": "https://via.placeholder.com/220x160?text=Keyboard", "stock": 25, "ratings": 4.9, "ratingsCount": 550, "shipping": 6.0},
-            {"id": "f5", "name": "Wireless Charging Pad, Fast Charge", "price": 25.00,
-             "img": "https://via.placeholder.com/220x160?text=Charger", "stock": 30, "ratings": 4.3, "ratingsCount": 90, "shipping": 2.0},
-        ]
+        if failed is not None:
+            failed[:] = feed_list(sources)
+        return fallback_products()
 
 
+@functools.lru_cache(maxsize=256)
 def star_str(rating):
     """Generates a string of stars based on the rating value."""
     full = "★" * int(math.floor(rating))
@@ -69,8 +253,857 @@ def star_str(rating):
     return full + empty
 
 
-# Main content area where the different views (Home, About, etc.) are rendered
-main_content = ft.Column(expand=True, spacing=12)
+# --- VIEW MODELS (render-ready display strings per product) ---
+
+@functools.lru_cache(maxsize=4096)
+def price_text(amount):
+    """Formats a euro amount; repeated amounts share one cached string."""
+    return f"€{amount:,.2f}"
+
+
+@functools.lru_cache(maxsize=1024)
+def count_text(n, template="{}"):
+    """Formats a count such as a cart quantity; repeated counts share one string."""
+    return template.format(n)
+
+
+@functools.lru_cache(maxsize=1024)
+def totals_text(subtotal, shipping):
+    """Subtotal, shipping and total lines of the cart summary."""
+    return (f"Subtotal: {price_text(subtotal)}", f"Shipping: {price_text(shipping)}",
+            f"Total: {price_text(subtotal + shipping)}")
+
+
+def _rating_text(p):
+    return sys.intern(star_str(p.get("ratings", 0)) + f" ({p.get('ratingsCount', 0)})")
+
+
+def _info_text(p):
+    return sys.intern(f"Seller: {p.get('seller', '-')} | Stock: {p.get('stock', 0)}")
+
+
+def _cart_name(p):
+    # Truncate name to fit cart view
+    raw_name = p.get("name", "Unnamed")
+    return (raw_name[:20] + "...") if len(raw_name) > 20 else raw_name
+
+
+# Display string -> (builder, product fields it is derived from)
+VIEW_FIELDS = {
+    "price_text": (lambda p: price_text(p.get("price", 0)), {"price"}),
+    "rating_text": (_rating_text, {"ratings", "ratingsCount"}),
+    "info_text": (_info_text, {"seller", "stock"}),
+    "cart_name": (_cart_name, {"name"}),
+}
+
+
+def build_view_model(p, vm=None, changed=None):
+    """Fills `vm` with the display strings for `p`.
+
+    With `changed` (a set of product fields) only the strings derived from
+    those fields are recomputed.
+    """
+    if vm is None:
+        vm = {}
+    for name, (build, fields) in VIEW_FIELDS.items():
+        if changed is None or not fields.isdisjoint(changed):
+            vm[name] = build(p)
+    return vm
+
+
+# --- CATALOG (products plus search index and sort orders) ---
+
+# Sort key per dropdown option. "Relevance" keeps feed order.
+SORT_KEYS = {
+    "Price: Low → High": lambda p: p["price"],
+    "Price: High → Low": lambda p: -p["price"],
+    "Top Rated": lambda p: (-p.get("ratings", 0), -p.get("ratingsCount", 0)),
+}
+# Product fields each sort order depends on (used to skip needless re-sorts)
+SORT_FIELDS = {
+    "Price: Low → High": {"price"},
+    "Price: High → Low": {"price"},
+    "Top Rated": {"ratings", "ratingsCount"},
+}
+SEARCH_FIELDS = {"name", "category"}
+
+
+def search_key(p):
+    """Lower-cased text a search query is matched against."""
+    return p["name"].lower() + "\x00" + p.get("category", "").lower()
+
+
+class QueryCache:
+    """Bounded LRU cache of search results keyed by (query, sort mode, catalog version).
+
+    `narrowest` finds the cached result of the longest prefix of a query, so
+    typing "k", "ke", "key" filters the previous result instead of the whole
+    catalog, and `same_query` finds the query under another sort mode, so a
+    new sort only reorders it. Not thread-safe on its own; Catalog calls it
+    under its lock.
+    """
+
+    def __init__(self, max_entries=QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.narrowed = 0
+        self.resorted = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _size(key, result):
+        # Products are shared with the catalog; only the list and key are ours
+        return sys.getsizeof(result) + sys.getsizeof(key[0])
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def narrowest(self, q, sort_val, version):
+        """Returns the cached result of the longest proper prefix of `q`, or None."""
+        for end in range(len(q) - 1, 0, -1):
+            result = self._entries.get((q[:end], sort_val, version))
+            if result is not None:
+                self._entries.move_to_end((q[:end], sort_val, version))
+                self.narrowed += 1
+                return result
+        return None
+
+    def same_query(self, q, version, sorts):
+        """Returns the cached result of `q` under the first of `sorts` that has one, or None."""
+        for sort_val in sorts:
+            result = self._entries.get((q, sort_val, version))
+            if result is not None:
+                self._entries.move_to_end((q, sort_val, version))
+                self.resorted += 1
+                return result
+        return None
+
+    def put(self, key, result):
+        if self.max_entries <= 0:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= self._size(key, old)
+        self._entries[key] = result
+        self.bytes += self._size(key, result)
+        while len(self._entries) > self.max_entries:
+            old_key, old = self._entries.popitem(last=False)
+            self.bytes -= self._size(old_key, old)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Hit/miss counts, hit rate, entry count and approximate bytes held."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "narrowed": self.narrowed,
+            "resorted": self.resorted,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self.bytes,
+        }
+
+
+class Catalog:
+    """Holds the product list with a search index and pre-sorted orders.
+
+    Products are patched in place by `apply_delta`, so references held by the
+    cart always see current prices and stock. `views` maps each id to its
+    view model (see build_view_model). Search results are cached in
+    `query_cache` until the next delta.
+    """
+
+    def __init__(self, products):
+        self.lock = threading.RLock()
+        self.version = 0
+        self.query_cache = QueryCache()
+        self.items = []
+        self.by_id = {}
+        self.search_index = {}
+        self.views = {}
+        # Feed position of each id; ties in every sort order fall back to it
+        self._rank = {}
+        self._next_rank = itertools.count()
+
+        if isinstance(products, SnapshotReader):
+            if set(products.orders) == set(SORT_KEYS):
+                self._load_snapshot(products)
+                return
+            products = products.records()
+        for p in products:
+            if p["id"] not in self.by_id:
+                self._add(p)
+        self.orders = {mode: list(self.items) for mode in SORT_KEYS}
+        for mode in self.orders:
+            self._sort(mode)
+
+    def _load_snapshot(self, snapshot):
+        """Fills the catalog from a snapshot, reusing its search keys and sort orders."""
+        # Snapshots are written from Catalog.items, so ids are already unique
+        self.items = snapshot.records()
+        ids = [p["id"] for p in self.items]
+        self.by_id = dict(zip(ids, self.items))
+        self.search_index = dict(zip(ids, snapshot.column("search")))
+        self.views = {pid: build_view_model(p) for pid, p in zip(ids, self.items)}
+        self._rank = dict(zip(ids, self._next_rank))
+        items = self.items
+        self.orders = {mode: [items[i] for i in snapshot.orders[mode].tolist()]
+                       for mode in SORT_KEYS}
+
+    def _add(self, p):
+        pid = p["id"]
+        self.items.append(p)
+        self.by_id[pid] = p
+        self.search_index[pid] = search_key(p)
+        self.views[pid] = build_view_model(p)
+        self._rank[pid] = next(self._next_rank)
+
+    def _order_key(self, mode):
+        key = SORT_KEYS[mode]
+        rank = self._rank
+        return lambda p: (key(p), rank[p["id"]])
+
+    def _sort(self, mode):
+        self.orders[mode].sort(key=self._order_key(mode))
+
+    def _take_out(self, seq, products, key):
+        """Removes `products` from `seq`, which must be sorted by `key`."""
+        if len(products) * 32 > len(seq):
+            # Large deltas: one filtering pass beats many list deletes
+            ids = {p["id"] for p in products}
+            seq[:] = [p for p in seq if p["id"] not in ids]
+            return
+        for p in products:
+            i = bisect.bisect_left(seq, key(p), key=key)
+            if i < len(seq) and seq[i] is p:
+                del seq[i]
+
+    def _put_back(self, mode, products):
+        """Inserts `products` into a sort order at their current position."""
+        order = self.orders[mode]
+        if len(products) * 32 > len(order):
+            order.extend(products)
+            self._sort(mode)
+            return
+        key = self._order_key(mode)
+        for p in products:
+            bisect.insort(order, p, key=key)
+
+    def search(self, q, sort_val="Relevance"):
+        """Returns products whose name or category contains `q`, in sort order."""
+        with self.lock:
+            if sort_val not in self.orders:
+                sort_val = "Relevance"
+            source = self.orders.get(sort_val, self.items)
+            if not q:
+                return list(source)
+            cache = self.query_cache
+            key = (q, sort_val, self.version)
+            result = cache.get(key)
+            if result is None:
+                # The same query under another sort has the right products already
+                sorts = [mode for mode in ("Relevance", *self.orders) if mode != sort_val]
+                other = cache.same_query(q, self.version, sorts)
+                if other is not None:
+                    if sort_val == "Relevance":
+                        rank = self._rank
+                        result = sorted(other, key=lambda p: rank[p["id"]])
+                    else:
+                        result = sorted(other, key=self._order_key(sort_val))
+                else:
+                    # Products matching "key" are a subset of those matching "ke"
+                    base = cache.narrowest(q, sort_val, self.version)
+                    if base is None:
+                        base = source
+                    index = self.search_index
+                    result = [p for p in base if q in index[p["id"]]]
+                cache.put(key, result)
+            return list(result)
+
+    def diff(self, fresh, keep_missing=False):
+        """Compares a freshly cleaned feed with the catalog, keyed by `id`.
+
+        Returns a delta dict: `added` (new products), `changed` (id -> only
+        the fields whose value changed) and `removed` (ids missing from feed).
+        With `keep_missing` nothing is removed, for feeds known to be partial.
+        """
+        added, changed, seen = [], {}, set()
+        by_id = self.by_id
+        for p in fresh:
+            pid = p["id"]
+            if pid in seen:
+                continue
+            seen.add(pid)
+            cur = by_id.get(pid)
+            if cur is None:
+                added.append(p)
+            elif cur != p:
+                changed[pid] = {k: v for k, v in p.items() if cur.get(k) != v}
+        removed = [] if keep_missing else [pid for pid in by_id if pid not in seen]
+        return {"added": added, "changed": changed, "removed": removed}
+
+    def apply_delta(self, delta):
+        """Applies a delta from `diff` in place and bumps `version`."""
+        with self.lock:
+            removed = [self.by_id[pid] for pid in delta["removed"]]
+            changed = [(self.by_id[pid], patch)
+                       for pid, patch in delta["changed"].items()]
+            moving = {mode: [p for p, patch in changed if not SORT_FIELDS[mode].isdisjoint(patch)]
+                      for mode in self.orders}
+
+            # Take products out while their old sort keys and ranks still hold
+            rank = self._rank
+            self._take_out(self.items, removed, lambda p: rank[p["id"]])
+            for mode, order in self.orders.items():
+                self._take_out(order, removed + moving[mode], self._order_key(mode))
+            for p in removed:
+                del self.by_id[p["id"]]
+                del self.search_index[p["id"]]
+                del self.views[p["id"]]
+                del rank[p["id"]]
+
+            for p, patch in changed:
+                p.update(patch)
+                if not SEARCH_FIELDS.isdisjoint(patch):
+                    self.search_index[p["id"]] = search_key(p)
+                build_view_model(p, self.views[p["id"]], patch)
+
+            for p in delta["added"]:
+                self._add(p)
+            for mode in self.orders:
+                self._put_back(mode, moving[mode] + delta["added"])
+            self.version += 1
+            # Results of the old version can no longer be hit; free them now
+            self.query_cache.clear()
+
+
+def start_catalog_sync(catalog, on_delta, sources=None, interval=CATALOG_SYNC_INTERVAL,
+                       precedence="first", snapshot_path=None, first_wait=None):
+    """Re-fetches the feeds every `interval` seconds in a daemon thread.
+
+    Non-empty deltas are applied to `catalog` and then passed to `on_delta`,
+    and the snapshot at `snapshot_path` is rewritten. A failed fetch keeps
+    the current catalog, and while any feed fails nothing is removed.
+    `first_wait` overrides the delay before the first fetch; with
+    `interval` 0 only that one fetch runs. Returns an Event that stops the
+    thread.
+    """
+    stop = threading.Event()
+
+    def loop():
+        wait = interval if first_wait is None else first_wait
+        while not stop.wait(wait):
+            wait = interval
+            failed = []
+            try:
+                fresh = load_feeds(sources, precedence, failed=failed)
+            except Exception as e:
+                print("Warning: catalog sync failed:", e)
+                fresh = None
+            if fresh is not None:
+                # A feed left out (e.g. failing right after a snapshot start, with
+                # no last good copy) is not a feed whose products were all removed
+                delta = catalog.diff(fresh, keep_missing=bool(failed))
+                if delta["added"] or delta["changed"] or delta["removed"]:
+                    catalog.apply_delta(delta)
+                    on_delta(delta)
+                    if snapshot_path:
+                        # This thread is the only writer, so items can't change mid-write
+                        save_catalog_snapshot(snapshot_path, catalog.items, sources, precedence)
+            if not interval:
+                break
+
+    threading.Thread(target=loop, name="catalog-sync", daemon=True).start()
+    return stop
+
+
+# --- CATALOG SNAPSHOT (binary, decoded column by column at startup) ---
+# Layout after the header: one fixed-width column per numeric field, a column
+# of end offsets per string field, optionally one index permutation per sort
+# order, then the string table: each string field's UTF-8 values back to back.
+
+SNAPSHOT_MAGIC = b"EMAJSNAP"
+SNAPSHOT_VERSION = 1
+# magic, version, flags, record count, crc32 of body, sources digest, body size
+SNAPSHOT_HEADER = struct.Struct("<8sHHII16sQ4x")
+SNAP_HAS_INDEX = 1
+SNAP_BIG_ENDIAN = 2
+SNAPSHOT_NUMBERS = (("price", "d"), ("shipping", "d"), ("ratings", "d"),
+                    ("stock", "q"), ("ratingsCount", "q"))
+SNAPSHOT_STRINGS = ("id", "name", "img", "category", "seller")
+# Fields with few distinct values; equal strings share one object after loading
+SNAPSHOT_INTERNED = ("category", "seller", "img")
+
+
+def sources_digest(sources=None, precedence="first"):
+    """Identifies the feed list and merge rule a snapshot was built from."""
+    if not isinstance(precedence, str):
+        precedence = f"{precedence.__module__}.{precedence.__qualname__}"
+    return hashlib.sha256("\n".join(feed_list(sources) + [precedence]).encode()).digest()[:16]
+
+
+def write_snapshot(path, products, sources=None, precedence="first", with_index=True):
+    """Writes cleaned products to a binary snapshot, atomically replacing `path`.
+
+    `products` must have unique ids, as `Catalog.items` does.
+    """
+    n = len(products)
+    parts = [array.array(code, (p.get(field, 0) for p in products)).tobytes()
+             for field, code in SNAPSHOT_NUMBERS]
+    string_fields = SNAPSHOT_STRINGS + (("search",) if with_index else ())
+    blobs = []
+    for field in string_fields:
+        values = [(search_key(p) if field == "search" else str(p.get(field, ""))).encode()
+                  for p in products]
+        parts.append(array.array("I", itertools.accumulate(map(len, values))).tobytes())
+        blobs.append(b"".join(values))
+    if with_index:
+        for key in SORT_KEYS.values():
+            perm = sorted(range(n), key=lambda i: (key(products[i]), i))
+            parts.append(array.array("I", perm).tobytes())
+    body = b"".join(parts + blobs)
+
+    flags = (SNAP_HAS_INDEX if with_index else 0) | (SNAP_BIG_ENDIAN if sys.byteorder == "big" else 0)
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, n,
+                                  zlib.crc32(body), sources_digest(sources, precedence), len(body))
+    # Write then rename, so processes mapping the old file keep a consistent view.
+    # Each writer gets its own temp file, so concurrent writers never share one.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                               prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(body)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def save_catalog_snapshot(path, products, sources=None, precedence="first"):
+    """Like write_snapshot, but only warns on failure (e.g. read-only disk)."""
+    try:
+        write_snapshot(path, products, sources, precedence)
+    except OSError as e:
+        print("Warning: could not write catalog snapshot:", e)
+
+
+class SnapshotReader:
+    """Reads the columns of a snapshot file through a read-only memory map.
+
+    `records()` decodes every record into a dict, column by column, and
+    `column()` and `orders` expose the stored search keys and sort orders.
+    load_catalog reads everything into the Catalog and then closes the
+    file: a snapshot start saves the download and JSON parsing, not the
+    decoding. Raises ValueError if the file is stale, corrupt or from
+    another version.
+    """
+
+    def __init__(self, path, sources=None, precedence="first"):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            self._map(sources, precedence)
+        except Exception:
+            self.close()
+            raise
+
+    def _map(self, sources, precedence):
+        mm = self._mm
+        if len(mm) < SNAPSHOT_HEADER.size:
+            raise ValueError("snapshot is truncated")
+        magic, version, flags, n, crc, digest, size = SNAPSHOT_HEADER.unpack_from(mm)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("not a version %d catalog snapshot" % SNAPSHOT_VERSION)
+        if bool(flags & SNAP_BIG_ENDIAN) != (sys.byteorder == "big"):
+            raise ValueError("snapshot was written on a machine with another byte order")
+        if digest != sources_digest(sources, precedence):
+            raise ValueError("snapshot was built from other product feeds or merge rule")
+        if size != len(mm) - SNAPSHOT_HEADER.size:
+            raise ValueError("snapshot is truncated")
+        body = self._view(SNAPSHOT_HEADER.size, size)
+        if zlib.crc32(body) != crc:
+            raise ValueError("snapshot checksum mismatch")
+
+        self._n = n
+        pos = SNAPSHOT_HEADER.size
+        self._numbers = {}
+        for field, code in SNAPSHOT_NUMBERS:
+            self._numbers[field] = self._view(pos, 8 * n, code)
+            pos += 8 * n
+        string_fields = SNAPSHOT_STRINGS + (("search",) if flags & SNAP_HAS_INDEX else ())
+        ends = {}
+        for field in string_fields:
+            ends[field] = self._view(pos, 4 * n, "I")
+            pos += 4 * n
+        self.orders = {}
+        if flags & SNAP_HAS_INDEX:
+            for mode in SORT_KEYS:
+                self.orders[mode] = self._view(pos, 4 * n, "I")
+                pos += 4 * n
+        # String table: (start of field blob, end offsets within it)
+        self._strings = {}
+        for field in string_fields:
+            self._strings[field] = (pos, ends[field])
+            pos += ends[field][-1] if n else 0
+
+    def _view(self, pos, size, fmt=None):
+        view = memoryview(self._mm)[pos:pos + size]
+        if fmt:
+            view = view.cast(fmt)
+        self._views.append(view)
+        return view
+
+    def column(self, field):
+        """Decodes every value of a string field in one pass."""
+        base, ends = self._strings[field]
+        if not self._n:
+            return []
+        raw = self._mm[base:base + ends[-1]]
+        starts = [0] + ends[:-1].tolist()
+        if raw.isascii():
+            # Byte offsets equal character offsets, so slice the decoded text
+            text = raw.decode()
+            values = [text[a:b] for a, b in zip(starts, ends.tolist())]
+        else:
+            values = [raw[a:b].decode() for a, b in zip(starts, ends.tolist())]
+        if field in SNAPSHOT_INTERNED:
+            shared = {}
+            values = [shared.setdefault(v, v) for v in values]
+        return values
+
+    def records(self):
+        """Decodes all records, one column at a time."""
+        fields = SNAPSHOT_STRINGS + tuple(field for field, _ in SNAPSHOT_NUMBERS)
+        columns = [self.column(field) for field in SNAPSHOT_STRINGS]
+        columns += [self._numbers[field].tolist() for field, _ in SNAPSHOT_NUMBERS]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
+
+    def __len__(self):
+        return self._n
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mm.close()
+
+
+def load_catalog_snapshot(path=CATALOG_SNAPSHOT_PATH, sources=None, precedence="first"):
+    """Opens the snapshot at `path`, or returns None if it is missing or unusable."""
+    try:
+        return SnapshotReader(path, sources, precedence)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print("Warning: ignoring catalog snapshot:", e)
+        return None
+
+
+def load_catalog(sources=None, snapshot_path=CATALOG_SNAPSHOT_PATH, precedence="first"):
+    """Builds the startup catalog, preferring a valid snapshot over the feeds.
+
+    `precedence` is the merge rule (see merge_feeds); a snapshot built with
+    another rule is not used. Returns (catalog, from_snapshot). Catalogs
+    loaded from the feeds are written back as a snapshot; the built-in
+    fallback data never is.
+    """
+    if snapshot_path:
+        snapshot = load_catalog_snapshot(snapshot_path, sources, precedence)
+        if snapshot is not None:
+            try:
+                return Catalog(snapshot), True
+            finally:
+                # Every record has been decoded into the catalog by now
+                snapshot.close()
+    failed = []
+    catalog = Catalog(safe_load_products(sources, precedence=precedence, failed=failed))
+    if snapshot_path and len(failed) < len(feed_list(sources)):
+        save_catalog_snapshot(snapshot_path, catalog.items, sources, precedence)
+    return catalog, False
+
+
+# --- PAGED CATALOG (products fetched from a paged API on demand) ---
+
+# Dropdown option -> `sort` parameter of the paged API
+PAGED_SORT_PARAMS = {
+    "Relevance": "relevance",
+    "Price: Low → High": "price_asc",
+    "Price: High → Low": "price_desc",
+    "Top Rated": "rating",
+}
+
+
+class PagedResult(Sequence):
+    """One listing of a PagedCatalog (all products or a search), loaded lazily.
+
+    len() is the total reported by the API; indexing fetches the page
+    holding that position on first use.
+    """
+
+    def __init__(self, catalog, url, params):
+        self.catalog = catalog
+        self.url = url
+        self.params = params
+        self._total = None
+        self._version = None
+
+    def __len__(self):
+        # A new catalog version means some listing's total changed; re-read ours
+        if self._total is None or self._version != self.catalog.version:
+            self._version = self.catalog.version
+            self._total = self.catalog._page(self.url, self.params, 0)[1]
+        return self._total
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("paged result index out of range")
+        size = self.catalog.page_size
+        page = self.catalog._page(self.url, self.params, i // size)[0]
+        if i % size >= len(page):
+            # The API returned a short page; the catalog changed under us
+            raise IndexError("paged result index out of range")
+        return page[i % size]
+
+
+class PagedCatalog:
+    """Catalog backed by a paged product API, loaded page by page on demand.
+
+    Pages come from `pages_url?sort=&offset=&limit=`, or with `cursor=`
+    instead of `offset=` while the previous page, which carries the
+    cursor the API handed out, is still cached. They are answered
+    with {"items": [...], "total": N, "next": cursor or null}. With
+    `search_url` queries run on the server (`search_url?q=&sort=&offset=
+    &limit=`, same answer); without it only the pages already in memory
+    are searched. At most `max_pages` pages stay in memory, least recently
+    used first out, and pages older than `max_age` seconds (0: no limit)
+    are fetched again. When a fetched page reports a new total for its
+    listing, `version` is bumped: cached searches and that listing's other
+    pages are dropped.
+
+    Offers the parts of Catalog the UI uses: items, views, search(),
+    lock, version and query_cache.
+    """
+
+    def __init__(self, pages_url, search_url=None, page_size=CATALOG_PAGE_SIZE,
+                 max_pages=CATALOG_PAGE_CACHE, max_age=CATALOG_SYNC_INTERVAL, timeout=8):
+        self.pages_url = pages_url
+        self.search_url = search_url
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.timeout = timeout
+        self.lock = threading.RLock()
+        self.version = 0
+        self.query_cache = QueryCache()
+        # View models of the products in cached pages; a product can be on
+        # several pages (one per listing), so each id counts its pages
+        self.views = {}
+        self._view_refs = {}
+        # (url, params, page number) -> (products, total, fetch time, next
+        # page's cursor or None), in LRU order
+        self._pages = OrderedDict()
+        self.page_hits = 0
+        self.page_misses = 0
+        self.items = self.search("")
+
+    def _expired(self, cached):
+        return self.max_age and time.monotonic() - cached[2] > self.max_age
+
+    def _page(self, url, params, number):
+        """Returns (products, total, fetch time, next cursor) of one API page, from the cache if possible."""
+        key = (url, params, number)
+        with self.lock:
+            cached = self._pages.get(key)
+            if cached is not None and not self._expired(cached):
+                self._pages.move_to_end(key)
+                self.page_hits += 1
+                return cached
+            self.page_misses += 1
+            # Cursors live with the page that handed them out, so they go
+            # when it is evicted, expires or is dropped for a moved total
+            previous = self._pages.get((url, params, number - 1))
+            cursor = previous[3] if previous is not None and not self._expired(previous) else None
+
+        query = dict(params, limit=self.page_size)
+        if cursor is not None:
+            query["cursor"] = cursor
+        else:
+            query["offset"] = number * self.page_size
+        data = json.loads(http_get(url + "?" + urllib.parse.urlencode(query), self.timeout).decode())
+        start = number * self.page_size
+        products = [clean_product(p, start + i) for i, p in enumerate(data["items"])]
+        cached = (products, int(data["total"]), time.monotonic(), data.get("next") or None)
+
+        with self.lock:
+            current = self._pages.get(key)
+            if current is not None and not self._expired(current):
+                # Another thread fetched the same page meanwhile; keep its copy
+                self._pages.move_to_end(key)
+                return current
+            if current is not None:
+                self._drop(key)
+            moved = [k for k, page in self._pages.items()
+                     if k[:2] == (url, params) and page[1] != cached[1]]
+            if moved:
+                # The listing grew or shrank: its other pages hold shifted
+                # offsets, and cached results and totals are out of date
+                for k in moved:
+                    self._drop(k)
+                self.version += 1
+                self.query_cache.clear()
+            self._pages[key] = cached
+            refs = self._view_refs
+            for p in products:
+                self.views[p["id"]] = build_view_model(p)
+                refs[p["id"]] = refs.get(p["id"], 0) + 1
+            while len(self._pages) > self.max_pages:
+                self._drop(next(iter(self._pages)))
+        return cached
+
+    def _drop(self, key):
+        """Removes a cached page and the view models no other cached page needs."""
+        products = self._pages.pop(key)[0]
+        refs = self._view_refs
+        for p in products:
+            refs[p["id"]] -= 1
+            if not refs[p["id"]]:
+                del refs[p["id"]]
+                del self.views[p["id"]]
+
+    def search(self, q, sort_val="Relevance"):
+        """Returns the products whose name or category contains `q`, in sort order.
+
+        The result is a PagedResult, or without a search endpoint a list of
+        the matches among the pages already loaded for that sort order.
+        """
+        if sort_val not in PAGED_SORT_PARAMS:
+            sort_val = "Relevance"
+        sort = PAGED_SORT_PARAMS[sort_val]
+        if q and not self.search_url:
+            # Not cached: the loaded pages change, and scanning at most
+            # max_pages pages is cheap
+            listing = self.search("", sort_val)
+            len(listing)  # loads the first page
+            return [p for p in self._loaded(listing) if q in search_key(p)]
+        key = (q, sort_val, self.version)
+        with self.lock:
+            result = self.query_cache.get(key)
+        if result is None:
+            if not q:
+                result = PagedResult(self, self.pages_url, (("sort", sort),))
+            else:
+                result = PagedResult(self, self.search_url, (("q", q), ("sort", sort)))
+            with self.lock:
+                self.query_cache.put(key, result)
+        return result
+
+    def _loaded(self, listing):
+        """Products of the cached pages of `listing`, in listing order."""
+        with self.lock:
+            numbers = sorted(number for url, params, number in self._pages
+                             if (url, params) == (listing.url, listing.params))
+            return [p for number in numbers
+                    for p in self._pages[(listing.url, listing.params, number)][0]]
+
+    def page_stats(self):
+        """Page cache hits, misses, hit rate and number of pages held."""
+        lookups = self.page_hits + self.page_misses
+        return {
+            "pages": len(self._pages),
+            "hits": self.page_hits,
+            "misses": self.page_misses,
+            "hit_rate": self.page_hits / lookups if lookups else 0.0,
+        }
+
+
+def open_paged_catalog(pages_url, search_url=None):
+    """Opens a PagedCatalog, or the built-in fallback catalog if its first page fails."""
+    catalog = PagedCatalog(pages_url, search_url, max_age=CATALOG_SYNC_INTERVAL)
+    try:
+        len(catalog.items)  # fetches the first page
+    except Exception as e:
+        print("Warning: failed to load remote products:", e)
+        return Catalog(fallback_products())
+    return catalog
+
+
+# --- SHARED CATALOG (one per process, used by every session) ---
+
+_catalog = None
+_catalog_lock = threading.Lock()
+# Per-session callbacks that receive each delta the sync thread applies
+_catalog_subscribers = []
+
+
+def shared_catalog():
+    """Returns the process-wide catalog, loading it and starting its sync on first use.
+
+    Flet runs main() once per browser session in the same process, so the
+    products, their indexes and the sync thread exist once and every
+    session subscribes to the deltas (see subscribe_catalog_deltas).
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            if CATALOG_PAGES_URL:
+                # Too large to download up front: pages are fetched as the grid needs them
+                _catalog = open_paged_catalog(CATALOG_PAGES_URL, CATALOG_SEARCH_URL)
+            else:
+                _catalog, from_snapshot = load_catalog(
+                    PRODUCT_FEEDS, CATALOG_SNAPSHOT_PATH, FEED_MERGE_RULE)
+                # A catalog started from a snapshot is checked against the feeds right away
+                if CATALOG_SYNC_INTERVAL or from_snapshot:
+                    start_catalog_sync(
+                        _catalog, _publish_delta, sources=PRODUCT_FEEDS,
+                        interval=CATALOG_SYNC_INTERVAL, precedence=FEED_MERGE_RULE,
+                        snapshot_path=CATALOG_SNAPSHOT_PATH,
+                        first_wait=0 if from_snapshot else None)
+        return _catalog
+
+
+def subscribe_catalog_deltas(callback):
+    """Calls `callback(delta)` after each applied delta; returns an unsubscribe function."""
+    with _catalog_lock:
+        _catalog_subscribers.append(callback)
+
+    def unsubscribe():
+        with _catalog_lock:
+            if callback in _catalog_subscribers:
+                _catalog_subscribers.remove(callback)
+    return unsubscribe
+
+
+def _publish_delta(delta):
+    with _catalog_lock:
+        callbacks = list(_catalog_subscribers)
+    for callback in callbacks:
+        # One broken session must not keep the others from updating
+        try:
+            callback(delta)
+        except Exception as e:
+            print("Warning: a session failed to apply a catalog update:", e)
 
 
 def main(page: ft.Page):
@@ -92,8 +1125,22 @@ def main(page: ft.Page):
     except Exception:
         pass
 
-    products = safe_load_products()
+    catalog = shared_catalog()
+    products = catalog.items
     cart = {}
+    # Guards cart and card_cache: the sync thread patches them (apply_catalog_delta)
+    # while Flet handler threads iterate them
+    session_lock = threading.RLock()
+
+    # --- SESSION STATE (Used by nested handler functions) ---
+    # Kept inside main() because Flet runs one main() per browser session
+    # in the same process; module globals would be shared between shoppers.
+    is_logged_in = False
+    # Tracks where the user should go after a successful login: "home" or "checkout"
+    login_redirect_target = "home"
+    # Main content area where the different views (Home, About, etc.) are rendered
+    main_content = ft.Column(expand=True, spacing=12)
+    # -------------------------------------------------------
 
     # Login controls (defined globally in main so handler can access values)
     login_username = ft.TextField(
@@ -132,14 +1179,32 @@ def main(page: ft.Page):
     products_column = ft.Column(spacing=8, expand=True)
     cart_column = ft.Column(spacing=8, expand=True)
 
-    subtotal_txt = ft.Text("Subtotal: €0.00", weight=ft.FontWeight.BOLD)
-    shipping_txt = ft.Text("Shipping: €0.00")
-    total_txt = ft.Text(
-        "Total: €0.00", weight=ft.FontWeight.BOLD, size=18, color=COLORS.RED_700)
+    # Views stay mounted (see show_view) and a control can only have one
+    # parent, so each view showing totals or the cart gets its own controls;
+    # recalc_totals and refresh_cart_ui keep all of them in sync
+    totals_txts = []
+    cart_listviews = []
+
+    def new_totals_txts():
+        triple = (
+            ft.Text("Subtotal: €0.00", weight=ft.FontWeight.BOLD),
+            ft.Text("Shipping: €0.00"),
+            ft.Text(
+                "Total: €0.00", weight=ft.FontWeight.BOLD, size=18, color=COLORS.RED_700),
+        )
+        totals_txts.append(triple)
+        return triple
+
+    def new_cart_listview():
+        listview = ft.ListView(expand=True, spacing=6, padding=6)
+        cart_listviews.append(listview)
+        return listview
+
+    subtotal_txt, shipping_txt, total_txt = new_totals_txts()
 
     # Using ResponsiveRow for product grid
     products_row = ft.ResponsiveRow(run_spacing=15, spacing=15, expand=True)
-    cart_listview = ft.ListView(expand=True, spacing=6, padding=6)
+    cart_listview = new_cart_listview()
 
     # --- Robust SnackBar Helper Function ---
     def show_message(message: str, color=COLORS.GREEN_700):
@@ -159,15 +1224,14 @@ def main(page: ft.Page):
 
     def update_sign_in_ui():
         """Updates the Sign In button text based on login status."""
-        global is_logged_in
         sign_in_btn.text = "Logout" if is_logged_in else "Sign In"
         sign_in_btn.style.bgcolor = COLORS.RED_700 if is_logged_in else COLORS.BLUE_400
         page.update()
 
     def navigate_to_login_or_logout(e=None):
         """Handles the header Sign In/Logout button click."""
-        global is_logged_in
-        global login_redirect_target
+        nonlocal is_logged_in
+        nonlocal login_redirect_target
         if is_logged_in:
             # Logout logic
             is_logged_in = False
@@ -181,8 +1245,7 @@ def main(page: ft.Page):
 
     def navigate_to_checkout(e=None):
         """Checks login status and navigates to Login or Place Order page."""
-        global is_logged_in
-        global login_redirect_target
+        nonlocal login_redirect_target
         if len(cart) == 0:
             show_message(
                 "Your cart is empty. Please add products first.", COLORS.AMBER_700)
@@ -204,8 +1267,8 @@ def main(page: ft.Page):
             return
 
         # Simulated successful login
-        global is_logged_in
-        global login_redirect_target
+        nonlocal is_logged_in
+        nonlocal login_redirect_target
         is_logged_in = True
         update_sign_in_ui()
 
@@ -228,15 +1291,16 @@ def main(page: ft.Page):
         Final order placement action. 
         FIX: Capture the total before clearing the cart.
         """
-        # 1. CAPTURE the current total string before we clear the cart
-        final_total_charged = total_txt.value
+        with session_lock:
+            # 1. CAPTURE the current total string before we clear the cart
+            final_total_charged = total_txt.value
 
-        show_message(
-            "Order #12345 confirmed! Thank Tyou for shopping with EMA-JOHN.", COLORS.PURPLE_700)
+            show_message(
+                "Order #12345 confirmed! Thank Tyou for shopping with EMA-JOHN.", COLORS.PURPLE_700)
 
-        # 2. After placing order, clear cart and refresh UI (this resets total_txt)
-        cart.clear()
-        refresh_cart_ui()
+            # 2. After placing order, clear cart and refresh UI (this resets total_txt)
+            cart.clear()
+            refresh_cart_ui()
 
         # 3. Pass the captured total to the confirmation screen
         render_order_confirmation(final_total_charged)
@@ -248,75 +1312,85 @@ def main(page: ft.Page):
     # Cart helpers
 
     def recalc_totals():
-        subtotal = sum(e["product"]["price"] * e["qty"] for e in cart.values())
-        shipping = sum(e["product"].get("shipping", 0) * e["qty"]
-                       for e in cart.values())
-        subtotal_txt.value = f"Subtotal: €{subtotal:,.2f}"
-        shipping_txt.value = f"Shipping: €{shipping:,.2f}"
-        total_txt.value = f"Total: €{(subtotal + shipping):,.2f}"
+        with session_lock:
+            subtotal = sum(e["product"]["price"] * e["qty"] for e in cart.values())
+            shipping = sum(e["product"].get("shipping", 0) * e["qty"]
+                           for e in cart.values())
+        lines = totals_text(subtotal, shipping)
+        for sub_txt, ship_txt, tot_txt in totals_txts:
+            sub_txt.value, ship_txt.value, tot_txt.value = lines
 
     def change_qty(pid, delta):
         """Adjust quantity for product id `pid` by `delta` (±1). Remove item when qty <= 0."""
-        entry = cart.get(pid)
-        if not entry:
-            return
-        # enforce integer
-        entry["qty"] = int(entry["qty"]) + int(delta)
-        # respect stock if available
-        stock = entry["product"].get("stock", None)
-        if stock is not None and entry["qty"] > stock:
-            entry["qty"] = stock
-            show_message("Reached available stock limit", COLORS.RED_500)
-            return
-        if entry["qty"] <= 0:
-            del cart[pid]
-        refresh_cart_ui()
+        with session_lock:
+            entry = cart.get(pid)
+            if not entry:
+                return
+            # enforce integer
+            entry["qty"] = int(entry["qty"]) + int(delta)
+            # respect stock if available
+            stock = entry["product"].get("stock", None)
+            if stock is not None and entry["qty"] > stock:
+                entry["qty"] = stock
+                show_message("Reached available stock limit", COLORS.RED_500)
+                return
+            if entry["qty"] <= 0:
+                del cart[pid]
+            refresh_cart_ui()
 
     def refresh_cart_ui():
-        cart_listview.controls.clear()
-        if not cart:
-            cart_listview.controls.append(
+        with session_lock:
+            for listview in cart_listviews:
+                listview.controls = build_cart_rows()
+            cart_count_txt.value = count_text(len(cart), "({})")
+            recalc_totals()
+            page.update()
+
+    def build_cart_rows():
+        rows = []
+        with session_lock:
+            # Rows are built from a copy, so the cart may change once the lock is released
+            entries = list(cart.items())
+        if not entries:
+            rows.append(
                 ft.Text("Your cart is empty", italic=True, color=COLORS.GREY_600))
         else:
-            for pid, entry in cart.items():
+            for pid, entry in entries:
                 p = entry["product"]
                 q = entry["qty"]
+                vm = catalog.views.get(pid) or build_view_model(p)
 
                 # Left: small image thumbnail
+                thumb = ft.Image(src=p.get("img", ""), width=60,
+                                 height=60, fit=FIT_CONTAIN)
                 img = ft.Container(
-                    ft.Image(src=p.get("img", ""), width=60,
-                             height=60, fit=FIT_CONTAIN),
+                    thumb,
                     width=60, height=60,
                     border_radius=4,
                     bgcolor=COLORS.WHITE,
                 )
 
-                # Truncate name to fit cart view
-                raw_name = p.get("name", "Unnamed")
-                display_name = (
-                    raw_name[:20] + "...") if len(raw_name) > 20 else raw_name
-
                 # Middle column: truncated name + unit price
+                name_txt = ft.Text(vm["cart_name"], max_lines=1,
+                                   overflow=ft.TextOverflow.ELLIPSIS, size=13)
+                price_txt = ft.Text(vm["price_text"], size=12,
+                                    weight=ft.FontWeight.BOLD, color=COLORS.RED_400)
                 name_price = ft.Column(
-                    [
-                        ft.Text(display_name, max_lines=1,
-                                overflow=ft.TextOverflow.ELLIPSIS, size=13),
-                        ft.Text(f"€{p.get('price', 0):,.2f}", size=12,
-                                weight=ft.FontWeight.BOLD, color=COLORS.RED_400),
-                    ],
+                    [name_txt, price_txt],
                     tight=True,
                     spacing=2,
                     expand=True
                 )
 
                 # Qty controls
+                qty_txt = ft.Text(
+                    count_text(q), width=20, text_align=ft.TextAlign.CENTER, weight=ft.FontWeight.BOLD)
                 qty_controls = ft.Row(
                     [
                         ft.IconButton(
                             ft.Icons.REMOVE_CIRCLE_OUTLINE, icon_size=18, tooltip="Decrease Quantity",
                             on_click=lambda e, pid=pid: change_qty(pid, -1)),
-                        ft.Text(
-                            str(q), width=20, text_align=ft.TextAlign.CENTER, weight=ft.FontWeight.BOLD),
+                        qty_txt,
                         ft.IconButton(ft.Icons.ADD_CIRCLE_OUTLINE, icon_size=18, tooltip="Increase Quantity",
                                       on_click=lambda e, pid=pid: change_qty(pid, +1)),
                     ],
@@ -326,7 +1400,7 @@ def main(page: ft.Page):
 
                 # Right: line total
                 line_total = ft.Text(
-                    f"€{p.get('price', 0) * q:,.2f}", weight=ft.FontWeight.BOLD, size=13)
+                    price_text(p.get("price", 0) * q), weight=ft.FontWeight.BOLD, size=13)
 
                 # Construct row (Image | Name/Price | Qty Controls | Total)
                 row = ft.Row(
@@ -342,39 +1416,54 @@ def main(page: ft.Page):
                     padding=ft.padding.only(top=4, bottom=8)
                 )
 
-                cart_listview.controls.append(
+                rows.append(
                     ft.Container(
                         ft.Column([row, total_container]),
                         padding=6,
                         border=ft.border.only(
-                            bottom=ft.border.BorderSide(1, COLORS.GREY_300))
+                            bottom=ft.border.BorderSide(1, COLORS.GREY_300)),
+                        # Lets a catalog delta patch this line in place
+                        data=(pid, {"img": thumb, "name": name_txt, "price": price_txt,
+                                    "qty": qty_txt, "total": line_total}),
                     )
                 )
-
-        cart_count_txt.value = f"({len(cart)})"
-        recalc_totals()
-        page.update()
+        return rows
+
+    def patch_cart_line(line, entry):
+        """Updates the strings of one cart row from its (patched) cart entry."""
+        p = entry["product"]
+        vm = catalog.views.get(p["id"]) or build_view_model(p)
+        controls = line.data[1]
+        controls["img"].src = p.get("img", "")
+        controls["name"].value = vm["cart_name"]
+        controls["price"].value = vm["price_text"]
+        controls["qty"].value = count_text(entry["qty"])
+        controls["total"].value = price_text(p.get("price", 0) * entry["qty"])
 
     def add_to_cart(p):
         pid = p["id"]
-        entry = cart.get(pid)
-        if entry:
-            # Check stock before adding
-            stock = p.get("stock", 0)
-            if entry["qty"] + 1 > stock:
-                show_message(
-                    "Cannot add more; reached available stock limit", COLORS.RED_500)
-                return
-            entry["qty"] += 1
-        else:
-            cart[pid] = {"product": p, "qty": 1}
-
-        show_message(f"Added {p['name']} to cart!", COLORS.GREEN_700)
-        refresh_cart_ui()
+        with session_lock:
+            entry = cart.get(pid)
+            if entry:
+                # Check stock before adding
+                stock = p.get("stock", 0)
+                if entry["qty"] + 1 > stock:
+                    show_message(
+                        "Cannot add more; reached available stock limit", COLORS.RED_500)
+                    return
+                entry["qty"] += 1
+            else:
+                cart[pid] = {"product": p, "qty": 1}
+
+            show_message(f"Added {p['name']} to cart!", COLORS.GREEN_700)
+            refresh_cart_ui()
 
     # ---------- Product card builder: Simplified for grid view ----------
 
     def build_product_card(p, img_size):
+        # Display strings are precomputed per product version by the catalog
+        # (a paged catalog drops them with their page, so rebuild if missing)
+        vm = catalog.views.get(p["id"]) or build_view_model(p)
         # Image is always displayed above details in a vertical stack (Column)
         image_box = ft.Container(
             content=ft.Image(src=p["img"], width=img_size,
@@ -386,12 +1475,10 @@ def main(page: ft.Page):
         details = ft.Column([
             ft.Text(p["name"], weight=ft.FontWeight.W_600,
                     max_lines=2, overflow=ft.TextOverflow.ELLIPSIS, size=15),
-            ft.Text(f"€{p['price']:,.2f}", weight=ft.FontWeight.BOLD,
+            ft.Text(vm["price_text"], weight=ft.FontWeight.BOLD,
                     size=17, color=COLORS.RED_700),
-            ft.Text(star_str(p.get("ratings", 0)) +
-                    f" ({p.get('ratingsCount', 0)})", size=12, color=COLORS.AMBER_700),
-            ft.Text(f"Seller: {p.get('seller', '-')} | Stock: {p.get('stock', 0)}",
-                    size=11, color=COLORS.GREY_600),
+            ft.Text(vm["rating_text"], size=12, color=COLORS.AMBER_700),
+            ft.Text(vm["info_text"], size=11, color=COLORS.GREY_600),
             ft.Container(height=4),  # Spacer
             ft.ElevatedButton(
                 "Add to cart",
@@ -447,53 +1534,130 @@ def main(page: ft.Page):
         img = int(min(220, card_width_approx * 0.90))
         return max(100, img)
 
-    def render_products(list_of_products):
+    # Grid tiles keyed by product id, reused across re-renders so that
+    # searching, sorting and catalog syncs only build cards that are new
+    card_cache = {}
+    card_img_size = None
+    # The grid shows the first `grid_shown` products of `grid_listing`
+    grid_listing = []
+    grid_shown = GRID_PAGE_SIZE
+
+    def current_img_size():
         # compute image size from current page width
         page_w = getattr(page, "window_width", None) or getattr(
             page, "client_width", None) or getattr(page, "width", None) or 1000
-        img_size = compute_img_size(int(page_w))
+        return compute_img_size(int(page_w))
+
+    def render_products(list_of_products):
+        nonlocal card_img_size, grid_listing
+        try:
+            # Only the visible window is built; a paged catalog fetches just its pages
+            window = list_of_products[:grid_shown]
+        except Exception as e:
+            show_message(f"Could not load products: {e}", COLORS.RED_500)
+            return
+        with session_lock:
+            grid_listing = list_of_products
+            img_size = current_img_size()
+            if img_size != card_img_size:
+                # Cards embed the image size, so a new size invalidates them all
+                card_cache.clear()
+                card_img_size = img_size
+
+            tiles = []
+            for p in window:
+                tile = card_cache.get(p["id"])
+                if tile is None:
+                    # Wrap the product card in a Container that defines its ResponsiveRow properties
+                    # xs=6: 2 items per row (mobile) | md=4: 3 items per row | xl=3: 4 items per row
+                    tile = ft.Container(
+                        content=build_product_card(p, img_size),
+                        col={"xs": 6, "sm": 6, "md": 4, "xl": 3},
+                    )
+                    card_cache[p["id"]] = tile
+                tiles.append(tile)
+            if len(card_cache) > GRID_CARD_CACHE:
+                on_screen = {id(tile) for tile in tiles}
+                for pid in [pid for pid, tile in card_cache.items() if id(tile) not in on_screen]:
+                    del card_cache[pid]
+            products_row.controls = tiles
+            show_more_btn.visible = len(list_of_products) > len(window)
+            page.update()
+
+    def show_more(e=None):
+        nonlocal grid_shown
+        if len(grid_listing) <= grid_shown:
+            return
+        grid_shown += GRID_PAGE_SIZE
+        render_products(grid_listing)
 
-        products_row.controls.clear()
+    def on_page_scroll(e):
+        # Load the next window as the shopper nears the bottom of the grid
+        if show_more_btn.visible and e.pixels >= e.max_scroll_extent - 400:
+            show_more()
 
-        for p in list_of_products:
-            # Wrap the product card in a Container that defines its ResponsiveRow properties
-            # xs=6: 2 items per row (mobile) | md=4: 3 items per row | xl=3: 4 items per row
-            products_row.controls.append(
-                ft.Container(
-                    content=build_product_card(p, img_size),
-                    col={"xs": 6, "sm": 6, "md": 4, "xl": 3},
-                )
-            )
+    show_more_btn = ft.TextButton("Show more", on_click=show_more, visible=False)
+
+    # --- View registry: each screen is built once and kept in main_content ---
+    views = {}
+
+    def show_view(name, build):
+        """Makes view `name` the visible one, building and mounting it on first use.
+
+        Later visits only flip `visible`, so page.update sends a few
+        properties instead of the whole subtree.
+        """
+        view = views.get(name)
+        if view is None:
+            view = views[name] = build()
+            main_content.controls.append(view)
+        for other in views.values():
+            other.visible = other is view
         page.update()
 
+    # Controls of cached views that change between visits
+    proceed_btn = ft.ElevatedButton("Proceed to Payment", on_click=navigate_to_checkout,
+                                    style=ft.ButtonStyle(
+                                        bgcolor=COLORS.GREEN_600, color=COLORS.WHITE),
+                                    expand=True)
+    place_order_btn = ft.ElevatedButton(
+        "Place Order Now",
+        icon=ft.Icons.SHOPPING_CART_CHECKOUT,
+        on_click=handle_place_order,
+        style=ft.ButtonStyle(
+            bgcolor=COLORS.RED_600, color=COLORS.WHITE, padding=20
+        )
+    )
+    total_charged_txt = ft.Text("", weight=ft.FontWeight.BOLD, size=18)
+
     def render_home():
-        main_content.controls.clear()
-        main_content.controls.append(build_responsive_layout())
-        page.update()
+        show_view("home", build_responsive_layout)
 
     def render_order_review():
         # Recalculate totals to ensure accurate display
         recalc_totals()
-
-        main_content.controls.clear()
-        main_content.controls.append(ft.Container(
+        # Disable if cart is empty
+        proceed_btn.disabled = len(cart) == 0
+        show_view("order_review", build_order_review)
+
+    def build_order_review():
+        review_listview = new_cart_listview()
+        review_listview.controls = build_cart_rows()
+        review_totals = new_totals_txts()
+        recalc_totals()
+        return ft.Container(
             ft.Column([
                 ft.Text("Order Review", weight=ft.FontWeight.BOLD,
                         size=24, color=COLORS.GREY_800),
                 ft.Divider(),
                 ft.Text(
                     "Review your cart items and shipping details before proceeding to payment."),
-                ft.Container(content=cart_listview, expand=True,
+                ft.Container(content=review_listview, expand=True,
                              # Set height for better layout
                              padding=ft.padding.only(top=10), height=300),
                 ft.Divider(),
-                subtotal_txt, shipping_txt, total_txt,
-                ft.ElevatedButton("Proceed to Payment", on_click=navigate_to_checkout,
-                                  # Disable if cart is empty
-                                  disabled=len(cart) == 0,
-                                  style=ft.ButtonStyle(
-                                      bgcolor=COLORS.GREEN_600, color=COLORS.WHITE),
-                                  expand=True),
+                *review_totals,
+                proceed_btn,
                 ft.TextButton("Continue Shopping",
                               on_click=lambda e: render_home())
             ], spacing=8),
@@ -501,12 +1665,13 @@ def main(page: ft.Page):
             bgcolor=COLORS.WHITE,
             border_radius=10,
             expand=True
-        ))
-        page.update()
+        )
 
     def render_login():
-        main_content.controls.clear()
-        main_content.controls.append(ft.Container(
+        show_view("login", build_login)
+
+    def build_login():
+        return ft.Container(
             ft.Column([
                 ft.Text("Sign In to Checkout", weight=ft.FontWeight.BOLD,
                         size=24, color=COLORS.BLUE_700),
@@ -535,15 +1700,18 @@ def main(page: ft.Page):
             width=500,  # Constrain width for a better form look
             alignment=ft.alignment.center,
 
-        ))
-        page.update()
+        )
 
     def render_place_order():
         # Ensure cart totals are calculated
         recalc_totals()
+        place_order_btn.disabled = len(cart) == 0  # Disable if cart is empty
+        show_view("place_order", build_place_order)
 
-        main_content.controls.clear()
-        main_content.controls.append(ft.Container(
+    def build_place_order():
+        order_subtotal_txt, order_shipping_txt, order_total_txt = new_totals_txts()
+        recalc_totals()
+        return ft.Container(
             ft.Column([
                 ft.Text("Finalize Order", weight=ft.FontWeight.BOLD,
                         size=28, color=COLORS.RED_700),
@@ -572,23 +1740,15 @@ def main(page: ft.Page):
 
                 # Total Summary
                 ft.Column([
-                    subtotal_txt,
-                    shipping_txt,
+                    order_subtotal_txt,
+                    order_shipping_txt,
                     ft.Divider(thickness=2),
-                    total_txt,
+                    order_total_txt,
                 ], spacing=5),
 
                 ft.Container(height=10),
 
-                ft.ElevatedButton(
-                    "Place Order Now",
-                    icon=ft.Icons.SHOPPING_CART_CHECKOUT,
-                    on_click=handle_place_order,
-                    disabled=len(cart) == 0,  # Disable if cart is empty
-                    style=ft.ButtonStyle(
-                        bgcolor=COLORS.RED_600, color=COLORS.WHITE, padding=20
-                    )
-                ),
+                place_order_btn,
 
                 ft.TextButton("Cancel and Return to Cart",
                               on_click=lambda e: render_order_review())
@@ -599,13 +1759,16 @@ def main(page: ft.Page):
             border_radius=10,
             width=500,  # Constrain width for a better form look
             alignment=ft.alignment.center
-        ))
-        page.update()
+        )
 
     def render_order_confirmation(final_total_charged_str: str):
         """Renders the order confirmation screen using the captured total."""
-        main_content.controls.clear()
-        main_content.controls.append(ft.Container(
+        # --- FIXED: Use the passed string instead of the reset global control ---
+        total_charged_txt.value = f"Total Charged: {final_total_charged_str}"
+        show_view("order_confirmation", build_order_confirmation)
+
+    def build_order_confirmation():
+        return ft.Container(
             ft.Column([
                 ft.Icon(ft.Icons.CHECK_CIRCLE_OUTLINE,
                         size=60, color=COLORS.GREEN_600),
@@ -614,10 +1777,7 @@ def main(page: ft.Page):
                 ft.Text(
                     "Your order #12345 has been confirmed and will be shipped soon.", color=COLORS.GREY_700),
                 ft.Divider(),
-                # --- FIXED: Use the passed string instead of the reset global control ---
-                ft.Text(
-                    f"Total Charged: {final_total_charged_str}", weight=ft.FontWeight.BOLD, size=18),
-                # ------------------------------------------------------------------------
+                total_charged_txt,
                 ft.Container(height=20),
                 ft.ElevatedButton("Back to Shopping", on_click=lambda e: render_home(),
                                   style=ft.ButtonStyle(bgcolor=COLORS.BLUE_400, color=COLORS.WHITE)),
@@ -629,12 +1789,14 @@ def main(page: ft.Page):
             border_radius=10,
             width=500,
             alignment=ft.alignment.center
-        ))
-        page.update()
+        )
 
     def render_contact():
-        main_content.controls.clear()
-        main_content.controls.append(ft.Container(
+        # Cached, so the form keeps what the user typed between visits
+        show_view("contact", build_contact)
+
+    def build_contact():
+        return ft.Container(
             ft.Column([
                 ft.Text("Contact Us", weight=ft.FontWeight.BOLD, size=24),
                 ft.Divider(),
@@ -653,12 +1815,13 @@ def main(page: ft.Page):
             padding=20,
             bgcolor=COLORS.WHITE,
             border_radius=10,
-        ))
-        page.update()
+        )
 
     def render_about():
-        main_content.controls.clear()
-        main_content.controls.append(ft.Container(
+        show_view("about", build_about)
+
+    def build_about():
+        return ft.Container(
             ft.Column([
                 ft.Text("About EMA-John", weight=ft.FontWeight.BOLD, size=24),
                 ft.Divider(),
@@ -670,8 +1833,7 @@ def main(page: ft.Page):
             padding=20,
             bgcolor=COLORS.WHITE,
             border_radius=10,
-        ))
-        page.update()
+        )
 
     # Top area (Header, Navigation, Search/Sort)
     top_area = ft.Column(
@@ -779,6 +1941,7 @@ def main(page: ft.Page):
         products_column.controls.append(ft.Divider())
         # products_row contains the responsive grid of product cards
         products_column.controls.append(products_row)
+        products_column.controls.append(show_more_btn)
 
         # Cart Column Setup
         cart_column.controls.clear()
@@ -807,22 +1970,24 @@ def main(page: ft.Page):
         return rr
 
     # Search / sort handlers
-    def on_search_or_sort(e=None):
-        q = search_input.value.strip().lower()
-        filtered = [p for p in products if (q in p["name"].lower() or q in p.get(
-            "category", "").lower())] if q else products.copy()
+    grid_query = None
 
+    def on_search_or_sort(e=None):
+        nonlocal grid_query, grid_shown
+        q = (search_input.value or "").strip().lower()
         sort_val = sort_dropdown.value or "Relevance"
-        if sort_val == "Price: Low → High":
-            filtered.sort(key=lambda x: x["price"])
-        elif sort_val == "Price: High → Low":
-            filtered.sort(key=lambda x: -x["price"])
-        elif sort_val == "Top Rated":
-            filtered.sort(
-                key=lambda x: (-x.get("ratings", 0), -x.get("ratingsCount", 0)))
-
-        # Update the product count text control with the filtered count
-        product_count_txt.value = f"({len(filtered)} items)"
+        if (q, sort_val) != grid_query:
+            # A new query or sort order starts again from the first window
+            grid_query = (q, sort_val)
+            grid_shown = GRID_PAGE_SIZE
+        try:
+            # The catalog keeps each sort order ready, so this is a single filter pass
+            filtered = catalog.search(q, sort_val)
+            # Update the product count text control with the filtered count
+            product_count_txt.value = count_text(len(filtered), "({} items)")
+        except Exception as err:
+            show_message(f"Could not load products: {err}", COLORS.RED_500)
+            return
 
         # Re-render filtered list using the new responsive logic
         render_products(filtered)
@@ -831,19 +1996,65 @@ def main(page: ft.Page):
     search_input.on_change = on_search_or_sort
     sort_dropdown.on_change = on_search_or_sort
 
-    # Layout builder function (handles initial load and resize)
+    # Background catalog sync: patch only the cards and cart lines a delta touches
+    def apply_catalog_delta(delta):
+        with session_lock:
+            for pid in delta["removed"]:
+                card_cache.pop(pid, None)
+            for pid in delta["changed"]:
+                tile = card_cache.get(pid)
+                if tile is not None:
+                    tile.content = build_product_card(catalog.by_id[pid], card_img_size)
+
+            # Patch the affected cart lines in place; only an emptied cart is rebuilt
+            gone = {pid for pid in delta["removed"] if cart.pop(pid, None) is not None}
+            patched = set()
+            for pid in delta["changed"]:
+                entry = cart.get(pid)
+                if entry is None:
+                    continue
+                # Products are patched in place; only the quantity may need clamping
+                stock = entry["product"].get("stock", 0)
+                if entry["qty"] > stock:
+                    entry["qty"] = stock
+                if entry["qty"] <= 0:
+                    del cart[pid]
+                    gone.add(pid)
+                else:
+                    patched.add(pid)
+            if gone and not cart:
+                refresh_cart_ui()
+            elif gone or patched:
+                for listview in cart_listviews:
+                    if gone:
+                        listview.controls = [line for line in listview.controls
+                                             if line.data[0] not in gone]
+                    for line in listview.controls:
+                        if line.data[0] in patched:
+                            patch_cart_line(line, cart[line.data[0]])
+                cart_count_txt.value = count_text(len(cart), "({})")
+                recalc_totals()
+
+            # Re-filter only when the grid's contents or order can change;
+            # unchanged tiles are reused from card_cache
+            q, sort_val = grid_query or ("", "Relevance")
+            moving = SORT_FIELDS.get(sort_val, set()) | (SEARCH_FIELDS if q else set())
+            if (delta["added"] or delta["removed"]
+                    or any(not moving.isdisjoint(patch) for patch in delta["changed"].values())):
+                on_search_or_sort()
+            else:
+                page.update()
+
+    # Layout builder function (handles resize)
     def layout_builder(e=None):
-        # We only update the page controls, the content inside main_content remains
-        page.controls.clear()
-        page.add(ft.Container(content=top_area,
-                              padding=ft.padding.symmetric(horizontal=12)))
-        page.add(ft.Container(content=main_content, padding=12, expand=True))
-
+        # The header and main_content are already on the page and keep their
+        # controls, so re-adding them would only resend every cached view.
         # When layout changes (resize), we must re-render products to adjust image size
         # This function also updates the product count
         on_search_or_sort()
 
     page.on_resize = layout_builder
+    page.on_scroll = on_page_scroll
 
     # Initial render sequence
     page.add(ft.Container(content=top_area,
@@ -855,6 +2066,10 @@ def main(page: ft.Page):
     # Call once to render initial product list and set the correct initial count
     on_search_or_sort()
 
+    # The shared catalog's sync thread reports its deltas to every open session
+    unsubscribe = subscribe_catalog_deltas(apply_catalog_delta)
+    page.on_disconnect = lambda e: unsubscribe()
+
 
 if __name__ == "__main__":
     ft.app(target=main, assets_dir="assets")
@@ -0,0 +1,140 @@
+"""Allocation profile of render passes, before and after view models.
+
+Drives one headless session (see headless.py) through repeated render
+passes. A pass switches the window width, which changes the card image
+size and so rebuilds every card in the grid, then steps one cart
+quantity up or down, which rebuilds the cart rows and totals.
+
+tracemalloc counts what the app's own code allocates during each pass,
+in total and in the functions that format display strings (prices,
+stars, counts, totals). The previous pass's controls are kept alive, so
+nothing it built is freed before the count. The passes run twice:
+
+- "formatting": before every pass the catalog's view models and the
+  formatting caches are emptied, so cards and cart rows format their
+  display strings again, as render passes did before build_view_model;
+- "view models": the code as it is, reading the precomputed strings.
+
+    python alloc_profile.py --passes 5 --cards 240 --cart 5
+
+Like load_test.py, it serves the catalog from a local stand-in feed.
+"""
+
+import argparse
+import gc
+import inspect
+import tracemalloc
+
+import flet as ft
+
+import Ema_jhon as app
+from headless import click, find, new_page, walk
+from load_test import serve_feed
+
+FORMAT_CACHES = (app.price_text, app.star_str, app.count_text, app.totals_text)
+FORMATTERS = (app.build_view_model, app._rating_text, app._info_text, app._cart_name,
+              *(cached.__wrapped__ for cached in FORMAT_CACHES))
+WIDTHS = (1000, 1400)
+
+
+def render_pass(page, i):
+    """Rebuilds every grid card and the cart once; returns the controls shown."""
+    page.window_width = WIDTHS[i % len(WIDTHS)]
+    page.on_resize(None)
+    tooltip = "Increase Quantity" if i % 2 == 0 else "Decrease Quantity"
+    click([b for b in find(page, ft.IconButton) if b.tooltip == tooltip][0])
+    return [c for top in page.controls for c in walk(top)]
+
+
+def forget_view_models():
+    app.shared_catalog().views.clear()
+    for cached in FORMAT_CACHES:
+        cached.cache_clear()
+
+
+def restore_view_models():
+    catalog = app.shared_catalog()
+    catalog.views.update((p["id"], app.build_view_model(p)) for p in catalog.items)
+
+
+def formatter_lines():
+    """Line numbers of the formatting functions in Ema_jhon.py."""
+    lines = set()
+    for func in FORMATTERS:
+        source, first = inspect.getsourcelines(func)
+        lines.update(range(first, first + len(source)))
+    return lines
+
+
+def profile(page, passes, formatting):
+    """Per render pass: (bytes, blocks) allocated by Ema_jhon.py and by its formatters."""
+    # Only the app's own frames count: its formatting is what view models save
+    only_app = [tracemalloc.Filter(True, app.__file__)]
+    formatters = formatter_lines()
+    kept = []
+    size = blocks = format_size = format_blocks = 0
+    for i in range(passes):
+        if formatting:
+            forget_view_models()
+        gc.collect()
+        before = tracemalloc.take_snapshot().filter_traces(only_app)
+        kept.append(render_pass(page, i))
+        after = tracemalloc.take_snapshot().filter_traces(only_app)
+        for stat in after.compare_to(before, "lineno"):
+            size += stat.size_diff
+            blocks += stat.count_diff
+            if stat.traceback[0].lineno in formatters:
+                format_size += stat.size_diff
+                format_blocks += stat.count_diff
+    if formatting:
+        restore_view_models()
+    return size / passes, blocks / passes, format_size / passes, format_blocks / passes
+
+
+def run(passes, cards, cart):
+    page = new_page("alloc-profile")
+    app.main(page)
+    for button in find(page, ft.ElevatedButton, "Add to cart")[:cart]:
+        click(button)
+    show_more = [b for b in find(page, ft.TextButton, "Show more") if b.visible]
+    while show_more and show_more[0].visible and len(find(page, ft.ElevatedButton, "Add to cart")) < cards:
+        click(show_more[0])
+    shown = len(find(page, ft.ElevatedButton, "Add to cart"))
+
+    tracemalloc.start()
+    # Warm up both modes so one-off allocations are not counted
+    profile(page, 2, formatting=True)
+    profile(page, 2, formatting=False)
+    results = {
+        "formatting": profile(page, passes, formatting=True),
+        "view models": profile(page, passes, formatting=False),
+    }
+    tracemalloc.stop()
+    return shown, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--passes", type=int, default=5, help="measured render passes per mode")
+    parser.add_argument("--cards", type=int, default=240, help="grid cards to show before measuring")
+    parser.add_argument("--cart", type=int, default=5, help="products to put in the cart")
+    parser.add_argument("--products", type=int, default=1000, help="size of the local stand-in feed")
+    args = parser.parse_args(argv)
+
+    app.PRODUCT_FEEDS = [serve_feed(args.products)]
+    app.CATALOG_SYNC_INTERVAL = 0
+    app.CATALOG_SNAPSHOT_PATH = None
+    shown, results = run(args.passes, args.cards, args.cart)
+
+    print(f"{shown} grid cards, {args.cart} cart lines, {args.passes} passes per mode")
+    print(f"{'mode':<14}{'KiB/pass':>12}{'blocks/pass':>14}{'format KiB':>14}{'format blocks':>16}")
+    for mode, (size, blocks, format_size, format_blocks) in results.items():
+        print(f"{mode:<14}{size / 1024:>12.1f}{blocks:>14.0f}{format_size / 1024:>14.1f}{format_blocks:>16.0f}")
+    before, after = results["formatting"][0], results["view models"][0]
+    if before:
+        print(f"view models allocate {100 * (before - after) / before:.0f}% less per render pass")
+    return results
+
+
+if __name__ == "__main__":
+    main()
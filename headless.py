@@ -0,0 +1,112 @@
+"""Headless Flet pages for driving Ema_jhon.main() without a client.
+
+A HeadlessConnection answers page updates the way the Flet client would
+(it hands out control ids) and counts the JSON payload of every update.
+The helpers below find controls in a page and fire their handlers, which
+is how load_test.py plays a shopper.
+
+Built on the flet 0.2x connection API (flet.core).
+"""
+
+import asyncio
+import itertools
+import json
+
+import flet as ft
+from flet.core.connection import Connection
+from flet.core.protocol import CommandEncoder, PageCommandsBatchResponsePayload
+
+# All headless pages share one event loop; handlers here are called synchronously
+_loop = asyncio.new_event_loop()
+
+
+class HeadlessConnection(Connection):
+    """Stands in for a Flet client and records what page.update would send."""
+
+    def __init__(self):
+        super().__init__()
+        self._ids = itertools.count(1)
+        self.updates = 0
+        self.bytes_sent = 0
+
+    def send_commands(self, session_id, commands):
+        payload = json.dumps(commands, cls=CommandEncoder)
+        self.updates += 1
+        self.bytes_sent += len(payload)
+        # "add" commands expect the ids of the new controls, one line per command
+        results = [" ".join(f"_{next(self._ids)}" for _ in c.commands)
+                   for c in commands if c.name == "add"]
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def send_command(self, session_id, command):
+        return self.send_commands(session_id, [command])
+
+
+def new_page(session_id="headless", width=1000):
+    """Creates a Page backed by a HeadlessConnection, reachable as `page.conn`."""
+    conn = HeadlessConnection()
+    page = ft.Page(conn, session_id, _loop)
+    page.window_width = width
+    page.conn = conn
+    return page
+
+
+def walk(control):
+    """Yields `control` and every control below it."""
+    yield control
+    for attr in ("controls", "content"):
+        child = getattr(control, attr, None)
+        if isinstance(child, list):
+            for c in child:
+                yield from walk(c)
+        elif isinstance(child, ft.Control):
+            yield from walk(child)
+
+
+def find(page, cls, text=None, **props):
+    """Returns the controls of type `cls` in `page` matching `text` and `props`."""
+    found = []
+    for c in walk(page):
+        if not isinstance(c, cls):
+            continue
+        if text is not None and getattr(c, "text", None) != text:
+            continue
+        if all(getattr(c, k, None) == v for k, v in props.items()):
+            found.append(c)
+    return found
+
+
+def find_one(page, cls, text=None, **props):
+    """Like find, but raises LookupError unless there is a match."""
+    found = find(page, cls, text, **props)
+    if not found:
+        raise LookupError(f"no {cls.__name__} {text or props!r} on the page")
+    return found[0]
+
+
+def _event(control, name, data=None):
+    return ft.ControlEvent(target=control.uid, name=name, data=data, control=control, page=control.page)
+
+
+def click(control):
+    """Fires the control's on_click handler."""
+    control.on_click(_event(control, "click"))
+
+
+def type_text(field, value):
+    """Sets a TextField's value and fires on_change like a keystroke would."""
+    field.value = value
+    if field.on_change:
+        field.on_change(_event(field, "change", value))
+
+
+def select(dropdown, value):
+    """Picks a Dropdown option and fires on_change."""
+    dropdown.value = value
+    if dropdown.on_change:
+        dropdown.on_change(_event(dropdown, "change", value))
+
+
+def count_controls(page):
+    """Number of controls currently reachable from the page."""
+    return sum(1 for _ in walk(page))
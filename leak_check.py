@@ -0,0 +1,166 @@
+"""Control-tree and memory leak check for view navigation.
+
+Drives one headless session (see headless.py) through repeated
+Home -> Order Review -> Login -> Checkout -> Logout loops. Each loop also
+resizes the window twice on Home, which rebuilds every grid card through
+layout_builder, and steps a cart quantity up and down on Order Review,
+which rebuilds the cart rows through refresh_cart_ui. After each step
+it records how many controls are on the page, how many Flet controls are
+still alive in the process and how many the page keeps in its id index.
+tracemalloc snapshots are taken after the warm-up loops and at the end.
+
+The check fails (exit status 1) if live controls, indexed controls or
+traced memory keep growing once the warm-up loops have filled the caches:
+
+    python leak_check.py --cycles 30 --warmup 5 --max-growth-kib 64
+
+Like load_test.py, it serves the catalog from a local stand-in feed.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+
+import flet as ft
+
+import Ema_jhon as app
+from headless import click, count_controls, find, find_one, new_page
+from load_test import serve_feed
+
+
+def live_controls():
+    """Flet controls still alive in the process, attached to a page or not."""
+    gc.collect()
+    return sum(1 for o in gc.get_objects() if isinstance(o, ft.Control))
+
+
+def indexed_controls(page):
+    # Controls the page still tracks by id (removed ones should drop out)
+    return len(page._index)
+
+
+WIDTHS = (1400, 1000)
+
+
+def cart_button(page, tooltip):
+    return [b for b in find(page, ft.IconButton) if b.tooltip == tooltip][0]
+
+
+def navigation_cycle(page):
+    """One Home -> Order Review -> Login -> Checkout -> Logout loop.
+
+    Yields the name of each view or step right after it is shown.
+    """
+    click(find_one(page, ft.TextButton, "Home"))
+    yield "Home"
+    # A new width changes the card image size, so every card is rebuilt
+    for width in WIDTHS:
+        page.window_width = width
+        page.on_resize(None)
+        yield f"Resize {width}"
+    click(find_one(page, ft.TextButton, "Order Review"))
+    yield "Order Review"
+    click(cart_button(page, "Increase Quantity"))
+    yield "Quantity +1"
+    click(cart_button(page, "Decrease Quantity"))
+    yield "Quantity -1"
+    click(find_one(page, ft.ElevatedButton, "Proceed to Payment"))
+    yield "Login"
+    for label, value in (("Username", "shopper"), ("Email", "s@example.com"), ("Password", "secret")):
+        find_one(page, ft.TextField, label=label).value = value
+    click(find_one(page, ft.ElevatedButton, "Login & Proceed"))
+    yield "Checkout"
+    # The header button logs out and returns Home, so the next loop sees Login again
+    click(find_one(page, ft.ElevatedButton, "Logout"))
+    yield "Logout"
+
+
+def _snapshot():
+    gc.collect()
+    # Leave out this script's own bookkeeping
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+
+
+def run(cycles, warmup, top):
+    """Runs the loops and returns (per-view stats, growth report)."""
+    page = new_page("leak-check")
+    app.main(page)
+    # Checkout needs a non-empty cart, and the quantity steps need stock for two
+    products = app.shared_catalog().items
+    first = next(i for i, p in enumerate(products) if p["stock"] >= 2)
+    click(find(page, ft.ElevatedButton, "Add to cart")[first])
+
+    views = {}
+    tracemalloc.start(10)
+    for cycle in range(warmup + cycles):
+        if cycle == warmup:
+            start_snapshot = _snapshot()
+            start_live, start_indexed = live_controls(), indexed_controls(page)
+        for view in navigation_cycle(page):
+            # Warm-up loops count too: the first walk over new controls
+            # fills some of Flet's lazily created attributes
+            tree, live = count_controls(page), live_controls()
+            if cycle >= warmup:
+                stats = views.setdefault(view, {"tree": set(), "live": set()})
+                stats["tree"].add(tree)
+                stats["live"].add(live)
+
+    end_snapshot = _snapshot()
+    tracemalloc.stop()
+    diff = end_snapshot.compare_to(start_snapshot, "lineno")
+    report = {
+        "live_growth": live_controls() - start_live,
+        "indexed_growth": indexed_controls(page) - start_indexed,
+        "memory_growth": sum(d.size_diff for d in diff),
+        "top": [d for d in diff if d.size_diff > 0][:top],
+    }
+    return views, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cycles", type=int, default=20, help="measured navigation loops")
+    parser.add_argument("--warmup", type=int, default=3, help="loops run before measuring")
+    parser.add_argument("--max-growth-kib", type=float, default=64,
+                        help="allowed traced-memory growth over all measured loops")
+    parser.add_argument("--top", type=int, default=10, help="allocation sites to list")
+    parser.add_argument("--products", type=int, default=50, help="size of the local stand-in feed")
+    args = parser.parse_args(argv)
+
+    app.PRODUCT_FEEDS = [serve_feed(args.products)]
+    app.CATALOG_SYNC_INTERVAL = 0
+    app.CATALOG_SNAPSHOT_PATH = None
+    views, report = run(args.cycles, args.warmup, args.top)
+
+    print(f"{'view':<14}{'page controls':>16}{'live controls':>16}")
+    for view, stats in views.items():
+        tree = "-".join(str(x) for x in (min(stats["tree"]), max(stats["tree"])))
+        live = "-".join(str(x) for x in (min(stats["live"]), max(stats["live"])))
+        print(f"{view:<14}{tree:>16}{live:>16}")
+    print()
+    print(f"live controls growth:    {report['live_growth']:+d}")
+    print(f"indexed controls growth: {report['indexed_growth']:+d}")
+    print(f"traced memory growth:    {report['memory_growth'] / 1024:+.1f} KiB over {args.cycles} loops")
+    for stat in report["top"]:
+        print("   ", stat)
+
+    failures = []
+    if report["live_growth"] > 0:
+        failures.append("live Flet controls grew across navigation loops")
+    if report["indexed_growth"] > 0:
+        failures.append("the page's control index grew across navigation loops")
+    if report["memory_growth"] > args.max_growth_kib * 1024:
+        failures.append(f"traced memory grew by more than {args.max_growth_kib:g} KiB")
+    for failure in failures:
+        print("FAIL:", failure)
+    if not failures:
+        print("OK: no growth across navigation loops")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Load generator for the EMA-JOHN app.
+
+Starts N simulated shopper sessions of Ema_jhon.main() on headless pages
+(see headless.py), plays scripted browse, search, sort, add-to-cart,
+login and checkout flows with think times, all N at once, and reports
+for each N: actions per second, p50/p95/p99 handler latency, page.update
+payload size, memory per session when created and still held after the
+flows (carts, cached views and tiles), and the process's peak RSS.
+
+    python load_test.py --sessions 1 10 100 1000 --products 500 --think 0.05
+
+The catalog comes from a local HTTP stand-in feed with --products items,
+or from --feed URL; --paged serves the stand-in as a paged API instead.
+Background sync and snapshots are switched off so every session measures
+the same work.
+"""
+
+import argparse
+import gc
+import http.server
+import json
+import os
+import random
+import threading
+import time
+import tracemalloc
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import flet as ft
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import Ema_jhon as app
+from headless import click, find, find_one, new_page, select, type_text
+
+SORT_OPTIONS = ["Price: Low → High", "Price: High → Low", "Top Rated", "Relevance"]
+WORDS = ["Wireless", "Ceramic", "Keyboard", "Premium", "Charger", "Webcam", "Studio", "Ultra"]
+
+
+def synthetic_products(n):
+    """Raw feed records for `n` made-up products (the same for the same `n`)."""
+    rnd = random.Random(n)
+    return [{
+        "id": f"p{i}",
+        "name": f"{rnd.choice(WORDS)} {rnd.choice(WORDS)} Model {i}",
+        "price": round(rnd.uniform(2, 500), 2),
+        "category": rnd.choice(["Audio", "Office", "Kitchen"]),
+        "seller": rnd.choice(["Acme", "Bolt", "Core", "Dyna"]),
+        "stock": rnd.randint(1, 40),
+        "ratings": rnd.choice([3.1, 3.9, 4.2, 4.6, 4.9]),
+        "ratingsCount": rnd.randint(0, 900),
+        "shipping": rnd.choice([0, 2.5, 5]),
+    } for i in range(n)]
+
+
+def _serve(handler):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def serve_feed(n):
+    """Serves a synthetic feed of `n` products on localhost; returns its URL."""
+    feed = json.dumps(synthetic_products(n)).encode()
+
+    class FeedHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(feed)))
+            self.end_headers()
+            self.wfile.write(feed)
+
+        def log_message(self, *args):
+            pass
+
+    return _serve(FeedHandler) + "/products.json"
+
+
+def serve_catalog_pages(n):
+    """Serves `n` synthetic products as a paged API (see Ema_jhon.PagedCatalog).
+
+    Returns (pages_url, search_url). Listings honour sort, offset, cursor
+    and limit; searches match name and category like Catalog.search.
+    """
+    products = [app.clean_product(p, i) for i, p in enumerate(synthetic_products(n))]
+    # Sort ties fall back to feed order, as in Catalog
+    orders = {"relevance": products}
+    for label, param in app.PAGED_SORT_PARAMS.items():
+        if label in app.SORT_KEYS:
+            orders[param] = sorted(products, key=app.SORT_KEYS[label])
+    keys = {p["id"]: app.search_key(p) for p in products}
+
+    class PagesHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            listing = orders.get(query.get("sort", "relevance"))
+            if url.path not in ("/products", "/search") or listing is None:
+                self.send_error(404)
+                return
+            if url.path == "/search":
+                q = query.get("q", "").lower()
+                listing = [p for p in listing if q in keys[p["id"]]]
+            # Cursors are opaque to the client; here they just encode the offset
+            if "cursor" in query:
+                offset = int(query["cursor"][1:])
+            else:
+                offset = int(query.get("offset", 0))
+            limit = int(query.get("limit", 100))
+            end = offset + limit
+            body = json.dumps({
+                "items": listing[offset:end],
+                "total": len(listing),
+                "next": f"o{end}" if end < len(listing) else None,
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    base = _serve(PagesHandler)
+    return base + "/products", base + "/search"
+
+
+class Session:
+    """One shopper: a headless page running main() plus its measurements."""
+
+    def __init__(self, sid, think, rnd):
+        self.page = new_page(f"load-{sid}")
+        self.think = think
+        self.rnd = rnd
+        self.latencies = []
+        self.payloads = []
+        self.errors = 0
+        app.main(self.page)
+
+    def act(self, handler, *args):
+        """Runs one UI handler and records its latency and update payload."""
+        conn = self.page.conn
+        before = conn.bytes_sent
+        start = time.perf_counter()
+        try:
+            handler(*args)
+        except Exception as e:
+            self.errors += 1
+            print("Warning: handler failed:", type(e).__name__, e)
+        self.latencies.append(time.perf_counter() - start)
+        self.payloads.append(conn.bytes_sent - before)
+        if self.think:
+            time.sleep(self.rnd.uniform(0, 2 * self.think))
+
+    def nav(self, label):
+        self.act(click, find_one(self.page, ft.TextButton, label))
+
+    # --- Scripted flows ---
+
+    def browse(self):
+        for label in ("Home", "About", "Contact", "Home"):
+            self.nav(label)
+
+    def search(self):
+        field = find_one(self.page, ft.TextField, hint_text="Search products...")
+        word = self.rnd.choice(WORDS).lower()
+        for i in range(1, len(word) + 1):
+            self.act(type_text, field, word[:i])
+        self.act(type_text, field, "")
+
+    def sort(self):
+        dropdown = find_one(self.page, ft.Dropdown)
+        for option in SORT_OPTIONS:
+            self.act(select, dropdown, option)
+
+    def add_to_cart(self, count=3):
+        buttons = find(self.page, ft.ElevatedButton, "Add to cart")
+        for button in self.rnd.sample(buttons, min(count, len(buttons))):
+            self.act(click, button)
+
+    def login_and_checkout(self):
+        self.nav("Order Review")
+        self.act(click, find_one(self.page, ft.ElevatedButton, "Proceed to Payment"))
+        if find(self.page, ft.ElevatedButton, "Login & Proceed"):
+            for label, value in (("Username", "shopper"), ("Email", "s@example.com"), ("Password", "secret")):
+                find_one(self.page, ft.TextField, label=label).value = value
+            self.act(click, find_one(self.page, ft.ElevatedButton, "Login & Proceed"))
+        self.act(click, find_one(self.page, ft.ElevatedButton, "Place Order Now"))
+        self.act(click, find_one(self.page, ft.ElevatedButton, "Back to Shopping"))
+
+    def run(self):
+        self.browse()
+        self.search()
+        self.sort()
+        self.add_to_cart()
+        self.login_and_checkout()
+
+
+def current_rss():
+    """Resident memory of this process in bytes (Linux only, else None)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_level(n, think, workers, seed):
+    """Creates `n` sessions, plays every flow concurrently and returns a result row.
+
+    With `workers` None every session gets its own thread, so all `n`
+    shoppers are active at the same time.
+    """
+    # Memory is read from the process RSS: tracing allocations would slow the
+    # flows and its own bookkeeping would inflate the figures. Without
+    # /proc, fall back to tracemalloc for the whole level.
+    tracing = current_rss() is None
+    if tracing:
+        tracemalloc.start()
+
+    def memory_used():
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] if tracing else current_rss()
+
+    base = memory_used()
+    sessions = [Session(i, think, random.Random(seed + i)) for i in range(n)]
+    created = memory_used()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(workers or n, n)) as pool:
+        list(pool.map(Session.run, sessions))
+    wall = time.perf_counter() - start
+    # What the sessions still hold after their flows: carts, cached views, tiles
+    retained = memory_used()
+    if tracing:
+        tracemalloc.stop()
+    # ru_maxrss is KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else 0.0
+
+    latencies = [x for s in sessions for x in s.latencies]
+    payloads = [x for s in sessions for x in s.payloads]
+    updates = sum(s.page.conn.updates for s in sessions)
+    sent = sum(s.page.conn.bytes_sent for s in sessions)
+    return {
+        "sessions": n,
+        "actions": len(latencies),
+        "actions_per_s": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "bytes_per_update": sent / updates if updates else 0,
+        "p95_action_bytes": percentile(payloads, 95),
+        "kib_per_session": (created - base) / n / 1024,
+        "kib_per_session_after": (retained - base) / n / 1024,
+        "peak_rss_mib": peak_rss,
+        "errors": sum(s.errors for s in sessions),
+    }
+
+
+def print_report(rows):
+    header = ("sessions", "actions", "act/s", "p50 ms", "p95 ms", "p99 ms",
+              "B/update", "p95 B/act", "KiB/sess", "KiB/sess end", "peak RSS MiB", "errors")
+    print(("{:>13}" * len(header)).format(*header))
+    for r in rows:
+        print(("{:>13}{:>13}{:>13.1f}{:>13.2f}{:>13.2f}{:>13.2f}{:>13.0f}{:>13.0f}{:>13.0f}{:>13.0f}{:>13.0f}{:>13}").format(
+            r["sessions"], r["actions"], r["actions_per_s"], r["p50_ms"], r["p95_ms"], r["p99_ms"],
+            r["bytes_per_update"], r["p95_action_bytes"], r["kib_per_session"],
+            r["kib_per_session_after"], r["peak_rss_mib"], r["errors"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 100],
+                        help="session counts to run, one report row each")
+    parser.add_argument("--products", type=int, default=200,
+                        help="size of the local stand-in feed")
+    parser.add_argument("--feed", help="use this product feed URL instead of the stand-in")
+    parser.add_argument("--paged", action="store_true",
+                        help="serve the stand-in catalog as a paged API (PagedCatalog)")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="mean think time between actions, in seconds")
+    parser.add_argument("--workers", type=int,
+                        help="threads playing sessions at the same time (default: one per session)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print rows as JSON")
+    args = parser.parse_args(argv)
+
+    if args.paged:
+        app.CATALOG_PAGES_URL, app.CATALOG_SEARCH_URL = serve_catalog_pages(args.products)
+    else:
+        app.PRODUCT_FEEDS = [args.feed or serve_feed(args.products)]
+    app.CATALOG_SYNC_INTERVAL = 0
+    app.CATALOG_SNAPSHOT_PATH = None
+    # The catalog is shared by all sessions; load it before measuring any of them
+    app.shared_catalog()
+
+    rows = [run_level(n, args.think, args.workers, args.seed) for n in args.sessions]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_report(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
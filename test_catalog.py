@@ -0,0 +1,383 @@
+"""Tests for the catalog delta sync, run with `python -m pytest -q`."""
+
+import http.server
+import json
+import socket
+import threading
+import time
+
+import flet as ft
+
+import Ema_jhon as app
+from headless import click, find, new_page, walk
+
+
+def product(pid, name="Item", price=10.0, **fields):
+    return app.clean_product(dict({"id": pid, "name": name, "price": price}, **fields), 0)
+
+
+def ids(products):
+    return [p["id"] for p in products]
+
+
+def serve_json(payloads):
+    """Serves payloads[path] on localhost (None answers 500); returns the base URL."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            payload = payloads.get(self.path)
+            if payload is None:
+                self.send_error(500)
+                return
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def join_sync_threads(timeout=10):
+    for thread in threading.enumerate():
+        if thread.name == "catalog-sync":
+            thread.join(timeout)
+
+
+def test_http_get_gives_up_after_one_timeout_on_a_hanging_feed():
+    # Accepts connections and never answers
+    server = socket.create_server(("127.0.0.1", 0))
+    accepted = []
+
+    def accept():
+        while True:
+            accepted.append(server.accept())
+
+    threading.Thread(target=accept, daemon=True).start()
+    url = f"http://127.0.0.1:{server.getsockname()[1]}/feed.json"
+
+    start = time.perf_counter()
+    try:
+        app.http_get(url, timeout=0.5)
+    except OSError:
+        pass
+    assert time.perf_counter() - start < 0.9
+    time.sleep(0.1)
+    assert len(accepted) == 1
+    server.close()
+
+
+def test_diff_reports_added_changed_and_removed():
+    catalog = app.Catalog([product("a", price=5), product("b", price=7), product("c")])
+    fresh = [product("a", price=6), product("c"), product("d")]
+
+    delta = catalog.diff(fresh)
+
+    assert ids(delta["added"]) == ["d"]
+    assert delta["changed"] == {"a": {"price": 6.0}}
+    assert delta["removed"] == ["b"]
+
+
+def test_apply_delta_patches_in_place_and_reorders():
+    catalog = app.Catalog([product("a", "Mug", 5), product("b", "Lamp", 7), product("c", "Desk", 9)])
+    mug = catalog.by_id["a"]
+    version = catalog.version
+
+    fresh = [product("a", "Mug", 20), product("c", "Desk", 9), product("d", "Chair", 1)]
+    catalog.apply_delta(catalog.diff(fresh))
+
+    # Products are patched, not replaced, so cart references stay current
+    assert catalog.by_id["a"] is mug and mug["price"] == 20
+    assert catalog.views["a"]["price_text"] == "€20.00"
+    assert "b" not in catalog.by_id and "b" not in catalog.views
+    assert ids(catalog.items) == ["a", "c", "d"]
+    assert ids(catalog.search("", "Price: Low → High")) == ["d", "c", "a"]
+    assert ids(catalog.search("", "Price: High → Low")) == ["a", "c", "d"]
+    assert catalog.version == version + 1
+
+
+def test_apply_delta_updates_search_index():
+    catalog = app.Catalog([product("a", "Mug"), product("b", "Lamp")])
+    assert ids(catalog.search("mug")) == ["a"]
+
+    catalog.apply_delta(catalog.diff([product("a", "Kettle"), product("b", "Lamp")]))
+
+    assert catalog.search("mug") == []
+    assert ids(catalog.search("kett")) == ["a"]
+
+
+def test_apply_delta_rebuilds_only_the_affected_view_strings(monkeypatch):
+    # Count builder calls: interned strings would look unchanged even if rebuilt
+    built = []
+
+    def counted(name, build):
+        return lambda p: built.append(name) or build(p)
+
+    monkeypatch.setattr(app, "VIEW_FIELDS", {name: (counted(name, build), fields)
+                                             for name, (build, fields) in app.VIEW_FIELDS.items()})
+    catalog = app.Catalog([product("a", "Mug", 5, ratings=4.2, ratingsCount=12, stock=3)])
+    vm = catalog.views["a"]
+    rating, info, name = vm["rating_text"], vm["info_text"], vm["cart_name"]
+
+    built.clear()
+    fresh = [product("a", "Mug", 6.5, ratings=4.2, ratingsCount=12, stock=3)]
+    catalog.apply_delta(catalog.diff(fresh))
+
+    assert built == ["price_text"]
+    assert catalog.views["a"] is vm
+    assert vm["price_text"] == "€6.50"
+    assert vm["rating_text"] is rating and vm["info_text"] is info and vm["cart_name"] is name
+
+    built.clear()
+    fresh = [product("a", "Mug", 6.5, ratings=4.2, ratingsCount=12, stock=9)]
+    catalog.apply_delta(catalog.diff(fresh))
+
+    assert built == ["info_text"]
+    assert vm["info_text"] != info and "Stock: 9" in vm["info_text"]
+    assert vm["rating_text"] is rating
+
+
+def test_search_narrows_cached_prefix_results():
+    catalog = app.Catalog([product("a", "Mug"), product("b", "Lamp"), product("c", "Muffin tin"),
+                           product("d", "Smug cat mug"), product("e", "Drum", category="Music")])
+
+    def full_scan(q):
+        return [p["id"] for p in catalog.items if q in app.search_key(p)]
+
+    narrowed = catalog.query_cache.stats()["narrowed"]
+    for q in ("m", "mu", "mug"):
+        assert ids(catalog.search(q)) == full_scan(q)
+    assert catalog.query_cache.stats()["narrowed"] == narrowed + 2
+
+    # After a delta the cached "mu" result is stale and must not be narrowed
+    catalog.apply_delta(catalog.diff(catalog.items + [product("f", "Mug rack")]))
+    assert ids(catalog.search("mug")) == full_scan("mug") == ["a", "d", "f"]
+    assert catalog.query_cache.stats()["narrowed"] == narrowed + 2
+
+
+def cart_lines(page):
+    return [c for c in walk(page) if isinstance(c, ft.Container) and isinstance(c.data, tuple)]
+
+
+def test_session_patches_cart_lines_in_place(monkeypatch):
+    catalog = app.Catalog([product("a", "Mug", 5, stock=5), product("b", "Lamp", 7, stock=5)])
+    monkeypatch.setattr(app, "_catalog", catalog)
+    monkeypatch.setattr(app, "_catalog_subscribers", [])
+    page = new_page("delta-test")
+    app.main(page)
+    click(find(page, ft.ElevatedButton, "Add to cart")[0])
+    click(find(page, ft.ElevatedButton, "Add to cart")[1])
+    mug_line, lamp_line = cart_lines(page)
+    searches = []
+    search = catalog.search
+    monkeypatch.setattr(catalog, "search", lambda *args: searches.append(args) or search(*args))
+
+    # A new price in the default Relevance order: lines patched, grid not re-filtered
+    delta = catalog.diff([product("a", "Mug", 6, stock=5), product("b", "Lamp", 7, stock=5)])
+    catalog.apply_delta(delta)
+    app._publish_delta(delta)
+
+    assert [line is old for line, old in zip(cart_lines(page), (mug_line, lamp_line))] == [True, True]
+    assert mug_line.data[1]["price"].value == "€6.00"
+    assert mug_line.data[1]["total"].value == "€6.00"
+    assert searches == []
+
+    # A removed product drops its line only, and re-filters the grid
+    delta = catalog.diff([product("a", "Mug", 6, stock=5)])
+    catalog.apply_delta(delta)
+    app._publish_delta(delta)
+
+    assert [line.data[0] for line in cart_lines(page)] == ["a"]
+    assert len(searches) == 1
+
+
+def test_sync_applies_feed_changes_from_http_server():
+    catalog = app.Catalog([product("a", "Mug", 5), product("b", "Lamp", 7)])
+    url = serve_json({"/feed.json": [
+        {"id": "a", "name": "Mug", "price": 8},
+        {"id": "c", "name": "Desk", "price": 3},
+    ]}) + "/feed.json"
+    deltas = []
+    done = threading.Event()
+
+    def on_delta(delta):
+        deltas.append(delta)
+        done.set()
+
+    app.start_catalog_sync(catalog, on_delta, sources=[url], interval=0, first_wait=0)
+
+    assert done.wait(10)
+    assert ids(deltas[0]["added"]) == ["c"]
+    assert deltas[0]["changed"] == {"a": {"price": 8.0}}
+    assert deltas[0]["removed"] == ["b"]
+    assert ids(catalog.search("", "Price: Low → High")) == ["c", "a"]
+
+
+def test_sync_keeps_products_of_a_failing_feed(tmp_path):
+    # As after a snapshot start: both feeds' products are in the catalog, but
+    # the second feed has no last good copy when it fails
+    base = serve_json({"/one.json": [{"id": "a", "name": "Mug", "price": 8}]})
+    sources = [base + "/one.json", base + "/two.json"]
+    catalog = app.Catalog([product("a", "Mug", 5), product("b", "Lamp", 7)])
+    snapshot = tmp_path / "catalog.snap"
+
+    app.start_catalog_sync(catalog, lambda delta: None, sources=sources,
+                           interval=0, snapshot_path=str(snapshot), first_wait=0)
+    # The snapshot is written after on_delta, so wait for the thread itself
+    join_sync_threads()
+
+    assert catalog.by_id["a"]["price"] == 8
+    assert "b" in catalog.by_id
+    loaded = app.SnapshotReader(str(snapshot), sources)
+    try:
+        assert sorted(p["id"] for p in loaded.records()) == ["a", "b"]
+    finally:
+        loaded.close()
+
+
+def test_concurrent_snapshot_writes(tmp_path):
+    path = str(tmp_path / "catalog.snap")
+    products = [product(f"p{i}", price=i) for i in range(200)]
+    errors = []
+
+    def write():
+        try:
+            for _ in range(5):
+                app.write_snapshot(path, products)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [f.name for f in tmp_path.iterdir()] == ["catalog.snap"]
+    loaded = app.SnapshotReader(path)
+    try:
+        assert len(loaded) == 200
+    finally:
+        loaded.close()
+
+
+def test_load_catalog_uses_merge_rule_and_matching_snapshot(tmp_path):
+    base = serve_json({
+        "/one.json": [{"id": "a", "name": "Mug", "price": 9}],
+        "/two.json": [{"id": "a", "name": "Mug", "price": 4}],
+    })
+    sources = [base + "/one.json", base + "/two.json"]
+    path = str(tmp_path / "catalog.snap")
+
+    catalog, from_snapshot = app.load_catalog(sources, path, "cheapest")
+    assert not from_snapshot and catalog.by_id["a"]["price"] == 4
+
+    catalog, from_snapshot = app.load_catalog(sources, path, "cheapest")
+    assert from_snapshot and catalog.by_id["a"]["price"] == 4
+    # A snapshot merged with another rule is not reused
+    catalog, from_snapshot = app.load_catalog(sources, path, "first")
+    assert not from_snapshot and catalog.by_id["a"]["price"] == 9
+
+
+def test_load_catalog_never_saves_fallback_data(tmp_path):
+    path = tmp_path / "catalog.snap"
+    catalog, _ = app.load_catalog([serve_json({}) + "/down.json"], str(path))
+    assert ids(catalog.items) == ids(app.fallback_products())
+    assert not path.exists()
+
+
+def test_paged_catalog_concurrent_misses_keep_view_refs_balanced():
+    items = [{"id": f"p{i}", "name": f"Item {i}", "price": i} for i in range(4)]
+    base = serve_json({f"/products?sort=relevance&limit=2&offset={o}": {
+        "items": items[o:o + 2], "total": 4, "next": None} for o in (0, 2)})
+    catalog = app.PagedCatalog(base + "/products", page_size=2, max_pages=1)
+
+    threads = [threading.Thread(target=catalog._page, args=(catalog.pages_url, (("sort", "relevance"),), 0))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert set(catalog._view_refs.values()) == {1}
+
+    # Evicting the page must drop its view models
+    catalog.items[3]
+    assert sorted(catalog.views) == ["p2", "p3"]
+
+
+def paged_payloads(items, page_size):
+    """Stand-in responses for the relevance listing of `items`."""
+    return {f"/products?sort=relevance&limit={page_size}&offset={o}": {
+        "items": items[o:o + page_size], "total": len(items), "next": None}
+        for o in range(0, max(len(items), 1), page_size)}
+
+
+def test_paged_local_search_only_scans_loaded_pages():
+    items = [{"id": f"p{i}", "name": f"Mug {i}", "price": i} for i in range(6)]
+    base = serve_json(paged_payloads(items, 2))
+    catalog = app.PagedCatalog(base + "/products", page_size=2)
+
+    # Only the first page is loaded until the grid asks for more
+    assert ids(catalog.search("mug")) == ["p0", "p1"]
+    catalog.items[4]
+    assert ids(catalog.search("mug")) == ["p0", "p1", "p4", "p5"]
+    assert len(catalog.query_cache) == 1  # only the listing itself
+
+
+def test_paged_catalog_notices_a_changed_total():
+    items = [{"id": f"p{i}", "name": f"Mug {i}", "price": i} for i in range(4)]
+    payloads = paged_payloads(items, 2)
+    base = serve_json(payloads)
+    catalog = app.PagedCatalog(base + "/products", page_size=2, max_age=0.05)
+    listing = catalog.items
+    assert len(listing) == 4 and listing[3]["id"] == "p3"
+
+    items.append({"id": "p4", "name": "Mug 4", "price": 4})
+    payloads.update(paged_payloads(items, 2))
+    time.sleep(0.1)
+
+    assert len(listing) == 4  # cached until the page is fetched again
+    listing[0]
+    assert catalog.version == 1
+    assert len(listing) == 5 and len(catalog.items) == 5
+
+
+def test_search_reorders_a_cached_result_for_a_new_sort():
+    catalog = app.Catalog([product("a", "Mug", 9, ratings=3), product("b", "Lamp", 2),
+                           product("c", "Mug", 5, ratings=5), product("d", "Mug", 5, ratings=4)])
+    assert ids(catalog.search("mug", "Price: Low → High")) == ["c", "d", "a"]
+
+    # Matching is done once; the other sort orders reuse that result
+    catalog.search_index.clear()
+    assert ids(catalog.search("mug")) == ["a", "c", "d"]
+    assert ids(catalog.search("mug", "Top Rated")) == ["c", "d", "a"]
+    assert ids(catalog.search("mug", "Price: High → Low")) == ["a", "c", "d"]
+    assert catalog.query_cache.stats()["resorted"] == 3
+
+
+def test_paged_cursors_go_with_their_pages():
+    items = [{"id": f"p{i}", "name": f"Mug {i}", "price": i} for i in range(4)]
+    by_cursor = dict(items[3], name="Mug 3 (cursor)")
+    base = serve_json({
+        "/products?sort=relevance&limit=2&offset=0": {"items": items[:2], "total": 4, "next": "c1"},
+        "/products?sort=relevance&limit=2&cursor=c1": {"items": [items[2], by_cursor], "total": 4, "next": None},
+        "/products?sort=relevance&limit=2&offset=2": {"items": items[2:], "total": 4, "next": None},
+    })
+    catalog = app.PagedCatalog(base + "/products", page_size=2, max_pages=1, max_age=0.05)
+    listing = catalog.items
+
+    # Page 0 is cached, so page 1 is fetched with the cursor it handed out
+    assert listing[3]["name"] == "Mug 3 (cursor)"
+    # Page 1 evicted page 0 and its cursor; once it expires it is fetched by offset
+    time.sleep(0.1)
+    assert listing[3]["name"] == "Mug 3"
+    assert len(catalog._pages) == 1